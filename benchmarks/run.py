@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for PyStandardPaths.
+
+All benchmarks run against a fake home directory and environment, so results
+do not depend on the machine's configuration. Only the backend of the current
+platform is measured.
+
+Usage::
+
+    python benchmarks/run.py                    # Run and print results.
+    python benchmarks/run.py --save master      # Store as a baseline.
+    python benchmarks/run.py --compare master   # Compare against a baseline.
+
+A comparison exits with status 1 if any benchmark is slower than its baseline
+by more than the threshold (20% by default).
+"""
+
+import argparse
+import collections
+import contextlib
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(ROOT, 'benchmarks', 'baselines')
+
+sys.path.insert(0, ROOT)
+
+import standardpaths    # noqa: E402
+from standardpaths import Location, clear_cache     # noqa: E402
+
+
+_benchmarks = collections.OrderedDict()
+
+
+def benchmark(func):
+    """Register a benchmark.
+
+    A benchmark is a generator function yielding `(name, callable, number)`.
+    Each callable is timed over `number` calls.
+    """
+    _benchmarks[func.__name__] = func
+    return func
+
+
+@contextlib.contextmanager
+def fake_environment(data_dirs=2, config_dirs=1):
+    """Point all relevant environment variables into a temporary directory.
+    """
+    root = tempfile.mkdtemp()
+    environ = os.environ.copy()
+    try:
+        for name in standardpaths.base._ENVIRON_NAMES:
+            os.environ.pop(name, None)
+        home = os.path.join(root, 'home')
+        runtime = os.path.join(root, 'run')
+        os.makedirs(os.path.join(home, '.config'))
+        os.mkdir(runtime, 0o700)
+        with open(os.path.join(home, '.config', 'user-dirs.dirs'), 'w') as f:
+            f.write('XDG_DESKTOP_DIR="$HOME/Desktop"\n')
+            f.write('XDG_DOWNLOAD_DIR="$HOME/Downloads"\n')
+            f.write('XDG_DOCUMENTS_DIR="$HOME/Documents"\n')
+        os.environ.update({
+            'HOME': home,
+            'USERPROFILE': home,
+            'TMPDIR': root,
+            'XDG_RUNTIME_DIR': runtime,
+            'XDG_DATA_DIRS': ':'.join(
+                os.path.join(root, 'share', str(i)) for i in range(data_dirs)
+            ),
+            'XDG_CONFIG_DIRS': ':'.join(
+                os.path.join(root, 'xdg', str(i)) for i in range(config_dirs)
+            ),
+        })
+        clear_cache()
+        yield root
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+        clear_cache()
+        shutil.rmtree(root)
+
+
+def _cold(func):
+    def run():
+        clear_cache()
+        func()
+    return run
+
+
+@benchmark
+def locations():
+    """Per-location latency, with a cold and a warm resolution cache.
+    """
+    config = standardpaths.Config('Yksom', 'uranusjr')
+    with fake_environment():
+        for location in Location:
+            for kind, func in [
+                    ('writable', standardpaths.get_writable_path),
+                    ('standard', standardpaths.get_standard_paths)]:
+                call = (lambda f=func, loc=location: f(loc, config))
+                yield ('{}.{}.cold'.format(kind, location.name),
+                       _cold(call), 1000)
+                yield ('{}.{}.warm'.format(kind, location.name),
+                       call, 10000)
+
+
+@benchmark
+def batch():
+    """Batch resolution of all locations.
+    """
+    with fake_environment():
+        yield ('resolve_all', standardpaths.resolve_all, 200)
+
+
+@benchmark
+def data_dirs_scaling():
+    """Cold lookups with long `XDG_DATA_DIRS` and `XDG_CONFIG_DIRS` lists.
+    """
+    config = standardpaths.Config('Yksom', 'uranusjr')
+    for count in (10, 100, 1000):
+        with fake_environment(data_dirs=count, config_dirs=count):
+            for location, as_str in itertools.product(
+                    (Location.app_data, Location.applications,
+                     Location.config),
+                    (False, True)):
+                call = _cold(
+                    lambda loc=location, s=as_str:
+                        standardpaths.get_standard_paths(loc, config, s),
+                )
+                yield ('data_dirs.{}.{}{}'.format(
+                    location.name, count, '.str' if as_str else '',
+                ), call, 50)
+
+
+@benchmark
+def tenants():
+    """Bulk resolution of application directories for many configs. Reported
+    per config.
+    """
+    locations = [
+        Location.app_data, Location.cache, Location.config, Location.log,
+    ]
+    count = 10000
+    configs = [
+        standardpaths.Config('app{}'.format(i), 'org{}'.format(i % 100))
+        for i in range(count)
+    ]
+    with fake_environment():
+        yield ('tenants.{}'.format(count),
+               lambda: standardpaths.resolve_configs_columns(
+                   locations, configs),
+               1, count)
+
+
+@benchmark
+def threaded():
+    """Warm lookups from multiple threads. Reported per call.
+    """
+    calls_per_thread = 2000
+
+    def work():
+        for _ in range(calls_per_thread):
+            standardpaths.get_writable_path(Location.cache)
+
+    for count in (1, 4, 16):
+        def run(count=count):
+            threads = [threading.Thread(target=work) for _ in range(count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        with fake_environment():
+            run(1)
+            # Normalize to per-call time by dividing in the reported number.
+            yield ('threads.{}'.format(count), run, 1,
+                   count * calls_per_thread)
+
+
+@benchmark
+def desktop_entries():
+    """Desktop entry catalogue of 2,000 entries, parsed and loaded from the
+    index in a new process (simulated by dropping in-memory records).
+    """
+    from standardpaths import desktop
+
+    with fake_environment(data_dirs=4) as root:
+        for i in range(2000):
+            directory = os.path.join(root, 'share', str(i % 4), 'applications')
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, 'app{}.desktop'.format(i)),
+                      'w') as f:
+                f.write('[Desktop Entry]\nType=Application\n')
+                f.write('Name=App {}\nExec=app{} %U\n'.format(i, i))
+
+        def parse(workers=None):
+            desktop._index.__init__()
+            desktop.get_desktop_entries(workers=workers, index=False)
+
+        def load():
+            desktop._index.__init__()
+            desktop.get_desktop_entries()
+
+        desktop.get_desktop_entries()
+        yield ('desktop.parse', parse, 5)
+        yield ('desktop.parse.workers', lambda: parse(4), 5)
+        yield ('desktop.index', load, 5)
+
+
+def _measure_import():
+    """Measure cumulative import time of the package, in seconds.
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import standardpaths'],
+        stderr=subprocess.STDOUT, cwd=ROOT, universal_newlines=True,
+    )
+    for line in output.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'standardpaths':
+            return int(parts[1]) / 1e6
+    raise RuntimeError('Could not find standardpaths in import time output')
+
+
+@benchmark
+def import_time():
+    """Import time of `standardpaths`, measured in a fresh interpreter.
+    """
+    yield ('import', _measure_import, None)
+
+
+def run_benchmarks(names, repeat):
+    results = collections.OrderedDict()
+    for name in names:
+        for spec in _benchmarks[name]():
+            label, func, number = spec[:3]
+            if number is None:
+                # The function measures itself.
+                results[label] = min(func() for _ in range(repeat))
+            else:
+                divisor = spec[3] if len(spec) > 3 else number
+                timings = timeit.repeat(func, repeat=repeat, number=number)
+                results[label] = min(timings) / divisor
+            print('{:<40} {:>12.3f} us'.format(label, results[label] * 1e6))
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print('{:<40} {:>12} {:>12} {:>8}'.format(
+        'benchmark', 'baseline', 'current', 'change',
+    ))
+    for label, value in results.items():
+        try:
+            base = baseline[label]
+        except KeyError:
+            print('{:<40} {:>12} {:>9.3f} us {:>8}'.format(
+                label, '-', value * 1e6, 'new',
+            ))
+            continue
+        change = value / base - 1 if base else 0
+        flag = ''
+        if change > threshold:
+            regressions.append(label)
+            flag = '  REGRESSION'
+        print('{:<40} {:>9.3f} us {:>9.3f} us {:>+7.1%}{}'.format(
+            label, base * 1e6, value * 1e6, change, flag,
+        ))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        'benchmarks', nargs='*', choices=[[]] + list(_benchmarks),
+        help='benchmarks to run (default: all)',
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='NAME', help='save as baseline')
+    parser.add_argument(
+        '--compare', metavar='NAME', help='compare against baseline',
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='relative slowdown reported as a regression (default: 0.2)',
+    )
+    options = parser.parse_args(argv)
+
+    results = run_benchmarks(options.benchmarks or list(_benchmarks),
+                             options.repeat)
+
+    if options.save:
+        if not os.path.isdir(BASELINE_DIR):
+            os.makedirs(BASELINE_DIR)
+        path = os.path.join(BASELINE_DIR, options.save + '.json')
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print('Saved baseline to {}'.format(path))
+
+    if options.compare:
+        path = os.path.join(BASELINE_DIR, options.compare + '.json')
+        with open(path) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print('{} regression(s) over {:.0%}'.format(
+                len(regressions), options.threshold,
+            ))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
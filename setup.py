@@ -27,8 +27,6 @@ with open('HISTORY.rst') as f:
 
 
 requirements = [
-    'pathlib2; python_version < "3.4"',
-    'enum34; python_version < "3.4"',
     'rubicon-objc; sys_platform == "darwin"',
 ]
 
@@ -51,6 +49,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=requirements,
+    python_requires='>=3.7',
     license='BSD',
     zip_safe=False,
     keywords='qstandardpaths',
@@ -59,11 +58,14 @@ setup(
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
         'Natural Language :: English',
-        "Programming Language :: Python :: 2",
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
     test_suite='tests',
     tests_require=test_requirements
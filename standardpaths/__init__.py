@@ -3,14 +3,24 @@
 
 __all__ = [
     '__author__', '__email__', '__version__', '__qtversion__',
-    'VERSION', 'QTVERSION', 'Config', 'Location', 'LocationError',
-    'configure', 'get_config', 'get_writable_path', 'get_standard_paths',
+    'VERSION', 'QTVERSION', 'CacheInfo', 'Config', 'Location',
+    'LocationError', 'ResolvedPaths', 'clear_cache', 'configure',
+    'disable_persistent_cache', 'disable_stats', 'enable_persistent_cache',
+    'enable_stats', 'ensure_dirs', 'get_backend',
+    'get_cache_info', 'get_config', 'get_stats', 'get_writable_path',
+    'get_standard_paths', 'register_backend', 'resolve_configs',
+    'resolve_configs_columns', 'resolve_many', 'resolve_all', 'set_backend',
+    'use_config',
 ]
 
 from .base import (
-    Config, Location, LocationError, configure, get_config,
-    _get_implementation,
+    CacheInfo, Config, Location, LocationError, ResolvedPaths,
+    clear_cache, configure, disable_stats, enable_stats, ensure_dirs,
+    get_backend, get_cache_info, get_config, get_stats, register_backend,
+    resolve_configs, resolve_configs_columns, set_backend, use_config,
+    _cache, _get_implementation, _resolve_many_with,
 )
+from .persistent import disable_persistent_cache, enable_persistent_cache
 
 VERSION = (0, 3, 2)
 QTVERSION = (5, 4, 1)
@@ -22,10 +32,14 @@ __version__ = '.'.join(str(i) for i in VERSION)
 __qtversion__ = '.'.join(str(i) for i in QTVERSION)
 
 
-def get_writable_path(location, config=None):
+def get_writable_path(location, config=None, as_str=False):
     """Get the directory where files of type should be written to. A
     :class:`.LocationError` is raised if the location cannot be determined.
 
+    If `as_str` is true, the path is returned as a string, equal to `str()`
+    of the returned path otherwise. This is faster if you do not need a
+    :class:`pathlib.Path`.
+
     :rtype: :class:`pathlib.Path`
 
     .. note::
@@ -34,18 +48,19 @@ def get_writable_path(location, config=None):
     """
     if not isinstance(location, Location):
         location = Location[str(location)]
-    return _get_implementation().get_writable_path(
-        location=location, config=config,
+    return _cache.lookup(
+        _get_implementation(), 'get_writable_path', location, config, as_str,
     )
 
 
-def get_standard_paths(location, config=None):
+def get_standard_paths(location, config=None, as_str=False):
     """Get all the directories where files of type belong.
 
     The list of directories is sorted from high to low priority, starting with
     :func:`.get_writable_path` if it can be determined. This list is empty if
     no locations for type are defined.
 
+    :param as_str: Return paths as strings. See :func:`.get_writable_path`.
     :rtype: :class:`pathlib.Path`
 
     .. seealso::
@@ -53,6 +68,40 @@ def get_standard_paths(location, config=None):
     """
     if not isinstance(location, Location):
         location = Location[str(location)]
-    return _get_implementation().get_standard_paths(
-        location=location, config=config,
+    paths = _cache.lookup(
+        _get_implementation(), 'get_standard_paths', location, config, as_str,
+    )
+    return list(paths)
+
+
+def resolve_many(locations, config=None, as_str=False):
+    """Resolve multiple locations in one pass.
+
+    This is equivalent to calling :func:`.get_writable_path` and
+    :func:`.get_standard_paths` on each location, but intermediate results
+    (environment lookups, `XDG_DATA_DIRS` parsing, etc.) are shared between
+    locations.
+
+    :param as_str: Return paths as strings. See :func:`.get_writable_path`.
+    :returns: An immutable mapping of :class:`.Location` to
+        :class:`.ResolvedPaths`, in the order of `locations`.
+
+    .. seealso::
+        :func:`.resolve_all`.
+    """
+    locations = [
+        location if isinstance(location, Location) else Location[str(location)]
+        for location in locations
+    ]
+    return _resolve_many_with(
+        _get_implementation(), locations, config, as_str,
     )
+
+
+def resolve_all(config=None, as_str=False):
+    """Resolve all locations in one pass.
+
+    .. seealso::
+        :func:`.resolve_many`.
+    """
+    return resolve_many(Location, config=config, as_str=as_str)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Print standard paths, so scripts can resolve all locations they need in
+one process::
+
+    $ python -m standardpaths --app Pepsi cache
+    {"cache": "/home/uranusjr/.cache/Pepsi"}
+    $ eval "$(python -m standardpaths --format shell cache log)"
+    $ echo "$STANDARDPATHS_CACHE"
+    /home/uranusjr/.cache
+"""
+
+import argparse
+import collections
+import json
+import re
+import shlex
+import sys
+
+from . import Config, Location, resolve_many
+
+
+def _format_json(results, options):
+    if options.standard_paths:
+        data = collections.OrderedDict(
+            (name, {
+                'writable_path': result.writable_path,
+                'standard_paths': list(result.standard_paths),
+            })
+            for name, result in results
+        )
+    else:
+        data = collections.OrderedDict(
+            (name, result.writable_path) for name, result in results
+        )
+    return json.dumps(data) + '\n'
+
+
+def _format_shell(results, options):
+    lines = []
+    for name, result in results:
+        name = options.prefix + name.upper()
+        lines.append('{}={}'.format(name, shlex.quote(
+            result.writable_path or '',
+        )))
+        if options.standard_paths:
+            lines.append('{}_PATHS={}'.format(name, shlex.quote(
+                ':'.join(result.standard_paths),
+            )))
+    return ''.join(line + '\n' for line in lines)
+
+
+def _format_nul(results, options):
+    if options.standard_paths:
+        # Paths are never empty, so an empty item ends each location.
+        paths = [
+            path for _, result in results
+            for path in list(result.standard_paths) + ['']
+        ]
+    else:
+        paths = [result.writable_path or '' for _, result in results]
+    return ''.join(path + '\0' for path in paths)
+
+
+_FORMATTERS = {
+    'json': _format_json,
+    'shell': _format_shell,
+    'nul': _format_nul,
+}
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m standardpaths',
+        description='Print standard paths of locations.',
+    )
+    parser.add_argument(
+        'locations', nargs='*', metavar='location',
+        help='locations to resolve (default: all)',
+    )
+    parser.add_argument('--app', default='', help='application name')
+    parser.add_argument('--org', default='', help='organization name')
+    parser.add_argument(
+        '--format', choices=sorted(_FORMATTERS), default='json',
+        help=(
+            'output format: a JSON object, KEY=value lines to eval in a '
+            'shell, or NUL-terminated paths (default: json)'
+        ),
+    )
+    parser.add_argument(
+        '-0', dest='format', action='store_const', const='nul',
+        help='same as --format=nul',
+    )
+    parser.add_argument(
+        '--prefix', default='STANDARDPATHS_',
+        help='prefix of variable names in shell output (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--standard-paths', action='store_true',
+        help=(
+            'also print all standard paths of each location; NUL output '
+            'ends the paths of each location with an empty item'
+        ),
+    )
+    options = parser.parse_args(argv)
+    if not re.match(r'^([A-Za-z_][A-Za-z0-9_]*)?$', options.prefix):
+        parser.error('invalid variable name prefix {!r}'.format(
+            options.prefix,
+        ))
+    for name in options.locations:
+        if name not in Location.__members__:
+            parser.error('unknown location {!r} (choose from {})'.format(
+                name, ', '.join(Location.__members__),
+            ))
+    return options
+
+
+def main(argv=None):
+    options = _parse_args(argv)
+    names = options.locations or [location.name for location in Location]
+    results = resolve_many(
+        names, config=Config(options.app, options.org), as_str=True,
+    )
+    # Output uses names as given, even if some are aliases of each other.
+    results = [(name, results[Location[name]]) for name in names]
+    formatter = _FORMATTERS[options.format]
+    sys.stdout.write(formatter(results, options))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""asyncio interface to PyStandardPaths.
+
+Resolution may block on the file system (e.g. reading `user-dirs.dirs`, or
+creating the runtime directory), so it is offloaded to a bounded thread pool.
+Concurrent identical requests share one in-flight future. Results already in
+the resolution cache are returned without leaving the event loop.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import threading
+
+from . import (
+    Location, ensure_dirs as _ensure_dirs, get_config,
+    get_standard_paths as _get_standard_paths,
+    get_writable_path as _get_writable_path, resolve_many as _resolve_many,
+)
+from .base import _cache, _get_environ_fingerprint, _get_implementation
+
+__all__ = [
+    'ensure_dir', 'ensure_dirs', 'get_standard_paths', 'get_writable_path',
+    'resolve_all', 'resolve_many', 'set_executor',
+]
+
+
+MAX_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Maps (event loop, request key) to in-flight futures.
+_in_flight = {}
+
+
+def set_executor(executor):
+    """Set the executor used to run blocking operations.
+
+    By default, a thread pool with at most :data:`MAX_WORKERS` threads is
+    created on first use. Pass `None` to revert to the default.
+    """
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_WORKERS,
+                thread_name_prefix='standardpaths',
+            )
+        return _executor
+
+
+def _to_location(location):
+    if isinstance(location, Location):
+        return location
+    return Location[str(location)]
+
+
+def _get_config(config):
+    # Executor threads do not see the caller's context, so a config set with
+    # use_config() must be resolved before a call is offloaded.
+    if config is None:
+        return get_config()
+    return config
+
+
+async def _run_coalesced(key, func, *args):
+    loop = asyncio.get_running_loop()
+    key = (loop, key, _get_environ_fingerprint())
+    try:
+        future = _in_flight[key]
+    except KeyError:
+        future = loop.run_in_executor(
+            _get_executor(), functools.partial(func, *args),
+        )
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shield the shared future, so a cancelled waiter does not cancel others.
+    return await asyncio.shield(future)
+
+
+async def get_writable_path(location, config=None):
+    """Coroutine version of :func:`standardpaths.get_writable_path`.
+    """
+    location = _to_location(location)
+    config = _get_config(config)
+    path = _cache.peek(
+        _get_implementation(), 'get_writable_path', location, config,
+    )
+    if path is not None:
+        return path
+    return await _run_coalesced(
+        ('get_writable_path', location, config),
+        _get_writable_path, location, config,
+    )
+
+
+async def get_standard_paths(location, config=None):
+    """Coroutine version of :func:`standardpaths.get_standard_paths`.
+    """
+    location = _to_location(location)
+    config = _get_config(config)
+    paths = _cache.peek(
+        _get_implementation(), 'get_standard_paths', location, config,
+    )
+    if paths is None:
+        paths = await _run_coalesced(
+            ('get_standard_paths', location, config),
+            _get_standard_paths, location, config,
+        )
+    # The list may be shared by coalesced callers.
+    return list(paths)
+
+
+async def resolve_many(locations, config=None):
+    """Coroutine version of :func:`standardpaths.resolve_many`.
+    """
+    locations = tuple(_to_location(location) for location in locations)
+    config = _get_config(config)
+    return await _run_coalesced(
+        ('resolve_many', locations, config),
+        _resolve_many, locations, config,
+    )
+
+
+async def resolve_all(config=None):
+    """Coroutine version of :func:`standardpaths.resolve_all`.
+    """
+    return await resolve_many(Location, config=config)
+
+
+async def ensure_dir(location, config=None, mode=0o777):
+    """Resolve the writable path of a location, and create the directory if
+    it does not exist.
+
+    :returns: The created (or existing) directory.
+    :rtype: :class:`pathlib.Path`
+
+    .. seealso::
+        :func:`standardpaths.ensure_dirs`.
+    """
+    location = _to_location(location)
+    results = await ensure_dirs([location], config=config, mode=mode)
+    return results[location]
+
+
+async def ensure_dirs(locations, config=None, mode=0o777):
+    """Coroutine version of :func:`standardpaths.ensure_dirs`.
+    """
+    locations = tuple(_to_location(location) for location in locations)
+    config = _get_config(config)
+    results = await _run_coalesced(
+        ('ensure_dirs', locations, config, mode),
+        _ensure_dirs, locations, config, mode,
+    )
+    # The dict may be shared by coalesced callers.
+    return collections.OrderedDict(results)
@@ -1,9 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import collections
+import contextlib
+import contextvars
 import enum
 import importlib
-import platform
+import os
+import stat
+import sys
+import threading
+import time
+import types
 
 
 class Location(enum.Enum):
@@ -67,7 +75,7 @@ class Location(enum.Enum):
     """
 
     temp = 7
-    """A directory where temporary files can be stored (the same as
+    """A directory where temporary files can be stored (usually the same as
     :func:`tempfile.gettempdir`). The returned value might be
     application-specific, shared among other applications for this user, or
     even system-wide. The returned path is never empty.
@@ -158,16 +166,59 @@ class LocationError(OSError):
 class Config(object):
     """Configuration class that holds application information.
 
+    Configs are immutable and hashable, and compare equal if they hold the
+    same information.
+
     .. seealso::
-        :func:`.configure` and :func:`.get_config`.
+        :func:`.configure`, :func:`.use_config` and :func:`.get_config`.
     """
+    __slots__ = ('application_name', 'organization_name', '_hash')
+
     def __init__(self, application_name='', organization_name=''):
-        self.application_name = application_name
-        self.organization_name = organization_name
+        setattr_ = super(Config, self).__setattr__
+        setattr_('application_name', application_name)
+        setattr_('organization_name', organization_name)
+        setattr_('_hash', hash((application_name, organization_name)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __repr__(self):
+        return '{}(application_name={!r}, organization_name={!r})'.format(
+            type(self).__name__, self.application_name,
+            self.organization_name,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Config):
+            return NotImplemented
+        return (self.application_name, self.organization_name) == (
+            other.application_name, other.organization_name,
+        )
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), (self.application_name, self.organization_name))
 
 
 _config = Config('', '')
 
+# Config set with use_config() in the current context, overriding _config.
+_context_config = contextvars.ContextVar(
+    'standardpaths_config', default=None,
+)
+
 
 def configure(application_name='', organization_name=''):
     """Configure default application information used by PyStandardPaths.
@@ -179,12 +230,124 @@ def configure(application_name='', organization_name=''):
     _config = Config(application_name, organization_name)
 
 
+@contextlib.contextmanager
+def use_config(config):
+    """Use `config` as the default configuration inside a `with` block.
+
+    The configuration is local to the current thread, or asyncio task, so
+    concurrent requests can use different application information. It
+    overrides the configuration set with :func:`.configure`.
+
+    .. seealso::
+        :func:`.get_config` and :class:`.Config`.
+    """
+    if not isinstance(config, Config):
+        raise TypeError('Expected a Config, got {!r}'.format(config))
+    token = _context_config.set(config)
+    try:
+        yield config
+    finally:
+        _context_config.reset(token)
+
+
 def get_config():
     """Get the current configuration of application information.
 
     :rtype: :class:`.Config`
     """
-    return _config
+    config = _context_config.get()
+    if config is None:
+        return _config
+    return config
+
+
+ResolvedPaths = collections.namedtuple(
+    'ResolvedPaths', ['writable_path', 'standard_paths'],
+)
+ResolvedPaths.__doc__ = """Resolution result of a location.
+
+`writable_path` is a :class:`pathlib.Path`, or `None` if the location cannot
+be determined. `standard_paths` is a tuple of :class:`pathlib.Path`, sorted
+from high to low priority.
+
+.. seealso::
+    :func:`.resolve_many`.
+"""
+
+
+def _convert_path(path, as_str):
+    """Convert a path (as either a string or a path object) to the requested
+    type.
+    """
+    if as_str:
+        return str(path)
+    import pathlib
+    if isinstance(path, pathlib.PurePath):
+        return path
+    return pathlib.Path(path)
+
+
+def _resolve_many(locations, config, get_writable_path, get_standard_paths,
+                  as_str=False):
+    """Resolve locations with backend-provided functions into an immutable
+    mapping.
+
+    `get_standard_paths` is called with the resolved writable path (or `None`)
+    as its third argument, so it does not need to be resolved again. The
+    functions may return either strings or path objects; results are
+    converted according to `as_str`.
+    """
+    results = collections.OrderedDict()
+    for location in locations:
+        if location in results:
+            continue
+        try:
+            path = get_writable_path(location, config)
+        except LocationError:
+            path = None
+        paths = tuple(
+            _convert_path(p, as_str)
+            for p in get_standard_paths(location, config, path)
+        )
+        if path is not None:
+            path = _convert_path(path, as_str)
+        results[location] = ResolvedPaths(path, paths)
+    return types.MappingProxyType(results)
+
+
+def _call_backend(implementation, name, location, config, as_str):
+    """Call `get_writable_path` or `get_standard_paths` of a backend.
+
+    Backends declaring `STRING_PATHS` produce strings themselves if `as_str`
+    is true; results of other backends are converted.
+    """
+    func = getattr(implementation, name)
+    if not as_str:
+        return func(location=location, config=config)
+    if getattr(implementation, 'STRING_PATHS', False):
+        return func(location=location, config=config, as_str=True)
+    value = func(location=location, config=config)
+    if name == 'get_writable_path':
+        return str(value)
+    return [str(path) for path in value]
+
+
+def _resolve_many_with(implementation, locations, config, as_str):
+    """Call `resolve_many` of a backend, converting results if needed.
+    """
+    if getattr(implementation, 'STRING_PATHS', False):
+        return implementation.resolve_many(
+            locations=locations, config=config, as_str=as_str,
+        )
+    results = implementation.resolve_many(locations=locations, config=config)
+    if not as_str:
+        return results
+    return _resolve_many(
+        results, config,
+        lambda location, config: results[location].writable_path,
+        lambda location, config, path: results[location].standard_paths,
+        as_str=True,
+    )
 
 
 def _append_org_and_app(path, config):
@@ -197,11 +360,764 @@ def _append_org_and_app(path, config):
     return path
 
 
-def _get_implementation():
-    """Get implementation module based on current OS.
+# Placeholders used to find where application information goes in a path.
+_TEMPLATE_CONFIG = Config('{application:9f2c}', '{organization:9f2c}')
+
+_UNSAFE_NAME_CHARS = ''.join(
+    c for c in (os.sep, os.altsep, ':' if os.name == 'nt' else None) if c
+)
+
+
+def _is_plain_name(name):
+    """Whether joining `name` to a path adds exactly one component to it.
+    """
+    if name in ('.', '..'):
+        return False
+    for c in _UNSAFE_NAME_CHARS:
+        if c in name:
+            return False
+    return True
+
+
+class _PathTemplate(object):
+    """The writable path of a location, compiled into strings to be joined
+    with application information.
+
+    `format()` returns `None` if the template cannot produce the same path
+    as the backend for a config, in which case the caller should resolve the
+    path normally.
+    """
+    def __init__(self, implementation, location):
+        get = implementation.get_writable_path
+        self.path = get(location=location, config=Config('', ''))
+        self.path_str = str(self.path)
+        path_str = str(get(location=location, config=_TEMPLATE_CONFIG))
+        head, org, rest = path_str.partition(
+            _TEMPLATE_CONFIG.organization_name,
+        )
+        sep, app, tail = rest.partition(_TEMPLATE_CONFIG.application_name)
+        if not org or not app:
+            # The location does not depend on application information.
+            self.parts = None
+        else:
+            self.parts = (head, sep, tail)
+            check = Config('a', 'b')
+            if self.format(check) != get(location=location, config=check):
+                self.parts = False
+
+    def format(self, config, as_str=False):
+        parts = self.parts
+        org = config.organization_name
+        app = config.application_name
+        if parts is None or not (org or app):
+            return self.path_str if as_str else self.path
+        if parts is False:
+            return None
+        if not (_is_plain_name(org) and _is_plain_name(app)):
+            return None
+        head, sep, tail = parts
+        if org and app:
+            path_str = head + org + sep + app + tail
+        else:
+            path_str = head + (org or app) + tail
+        return path_str if as_str else _to_paths('get_writable_path', path_str)
+
+
+def resolve_configs(locations, configs, as_str=False):
+    """Resolve writable paths of locations for many configs.
+
+    This is equivalent to calling :func:`.get_writable_path` for each pair of
+    location and config, but directories that do not depend on application
+    information are resolved only once, so resolving for each config is
+    cheap. Results are produced lazily.
+
+    :param locations: Locations to resolve.
+    :param configs: An iterable of :class:`.Config`.
+    :param as_str: Produce paths as strings instead of :class:`pathlib.Path`.
+    :returns: An iterator of `(config, paths)` pairs, where `paths` is a dict
+        mapping each location to its writable path, or `None` if it cannot be
+        determined.
+
+    .. note::
+        The environment is read once, when the first result is requested.
+
+    .. seealso::
+        :func:`.resolve_configs_columns`.
+    """
+    implementation = _get_implementation()
+    locations = [
+        location if isinstance(location, Location) else Location[str(location)]
+        for location in locations
+    ]
+    templates = []
+    for location in locations:
+        try:
+            templates.append(_PathTemplate(implementation, location))
+        except LocationError:
+            templates.append(None)
+    for config in configs:
+        paths = {}
+        for location, template in zip(locations, templates):
+            if template is None:
+                path = None
+            else:
+                path = template.format(config, as_str)
+                if path is None:
+                    # Not expressible with the template; resolve normally.
+                    try:
+                        path = _call_backend(
+                            implementation, 'get_writable_path', location,
+                            config, as_str,
+                        )
+                    except LocationError:
+                        pass
+            paths[location] = path
+        yield config, paths
+
+
+def resolve_configs_columns(locations, configs, as_str=False):
+    """Resolve writable paths of locations for many configs, as columns.
+
+    :returns: A dict mapping each location to a list of writable paths (or
+        `None`), in the order of `configs`.
+
+    .. seealso::
+        :func:`.resolve_configs`.
+    """
+    locations = [
+        location if isinstance(location, Location) else Location[str(location)]
+        for location in locations
+    ]
+    columns = collections.OrderedDict(
+        (location, []) for location in locations
+    )
+    appends = [columns[location].append for location in locations]
+    for _, paths in resolve_configs(locations, configs, as_str):
+        for location, append in zip(locations, appends):
+            append(paths[location])
+    return columns
+
+
+# Environment variables that may affect path resolution on any platform. A
+# change in any of these invalidates the resolution cache.
+_ENVIRON_NAMES = (
+    'HOME', 'USERPROFILE', 'HOMEDRIVE', 'HOMEPATH',
+    'TMPDIR', 'TEMP', 'TMP',
+    'XDG_CACHE_HOME', 'XDG_CONFIG_DIRS', 'XDG_CONFIG_HOME',
+    'XDG_DATA_DIRS', 'XDG_DATA_HOME', 'XDG_RUNTIME_DIR',
+)
+
+
+def _get_environ_values():
+    """Get values of relevant environment variables, as strings.
+    """
+    environ = os.environ
+    return tuple(environ.get(name) for name in _ENVIRON_NAMES)
+
+
+# (environ, mapping, keys) to read variables from the mapping behind
+# os.environ. See _get_environ_fingerprint().
+_environ_reader = (None, None, None)
+
+
+def _get_environ_fingerprint():
+    """Get a value that changes whenever a relevant environment variable
+    changes.
+
+    This is called on every cache lookup, so values are read from the mapping
+    behind :data:`os.environ` with pre-encoded keys, skipping the decoding
+    (and the exception on missing keys) of `os.environ.get()`. These are
+    CPython internals, so if they are missing (e.g. on other implementations,
+    or if :data:`os.environ` is replaced), values are read with the public
+    interface instead.
+    """
+    global _environ_reader
+    environ, data, keys = _environ_reader
+    if environ is not os.environ:
+        environ = os.environ
+        try:
+            data = environ._data
+            keys = tuple(environ.encodekey(name) for name in _ENVIRON_NAMES)
+        except AttributeError:
+            return _get_environ_values()
+        _environ_reader = (environ, data, keys)
+    get = data.get
+    return tuple([get(key) for key in keys])
+
+
+class _Stats(object):
+    """Collected resolution statistics.
+
+    Counters are grouped by kind (e.g. `cache`, `fallback`, `fs`). Call
+    latencies are kept per location, with the most recent `samples` values
+    used to compute percentiles.
+    """
+    def __init__(self, hook=None, samples=1024):
+        self.hook = hook
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._counters = collections.defaultdict(collections.Counter)
+        self._totals = collections.Counter()
+        self._latencies = collections.defaultdict(
+            lambda: collections.deque(maxlen=self.samples),
+        )
+
+    def record(self, kind, name, value):
+        with self._lock:
+            self._counters[kind][name] += value
+        if self.hook is not None:
+            self.hook(kind, name, value)
+
+    def record_call(self, name, elapsed):
+        with self._lock:
+            self._counters['calls'][name] += 1
+            self._totals[name] += elapsed
+            self._latencies[name].append(elapsed)
+        if self.hook is not None:
+            self.hook('call', name, elapsed)
+
+    def snapshot(self):
+        with self._lock:
+            result = {
+                kind: dict(counter)
+                for kind, counter in self._counters.items()
+            }
+            latencies = {
+                name: sorted(values)
+                for name, values in self._latencies.items()
+            }
+            totals = dict(self._totals)
+        result['latency'] = {
+            name: {
+                'total': totals[name],
+                'p50': _get_percentile(values, 50),
+                'p90': _get_percentile(values, 90),
+                'p99': _get_percentile(values, 99),
+            }
+            for name, values in latencies.items()
+        }
+        return result
+
+
+def _get_percentile(sorted_values, percent):
+    index = int(round((len(sorted_values) - 1) * percent / 100.0))
+    return sorted_values[index]
+
+
+# Active statistics collector. None if statistics are disabled.
+_stats = None
+
+
+def _record(kind, name, value=1):
+    """Record an event to the statistics collector, if enabled.
+    """
+    stats = _stats
+    if stats is not None:
+        stats.record(kind, name, value)
+
+
+def _get_logger():
+    """Get the library's logger. :mod:`logging` is only imported when
+    something is logged, which is rare.
+    """
+    import logging
+    return logging.getLogger('standardpaths')
+
+
+def enable_stats(hook=None, samples=1024):
+    """Start collecting resolution statistics.
+
+    Statistics are disabled by default, and cost almost nothing until they
+    are enabled. Enabling statistics resets previously collected values.
+
+    :param hook: An optional callable, called with `(kind, name, value)` for
+        each recorded event, e.g. `('call', 'cache', 1.2e-06)` for a call
+        taking 1.2 microseconds to resolve :attr:`.Location.cache`, or
+        `('fallback', 'runtime', 1)` when a fallback is used.
+    :param samples: Number of recent latency samples kept per location to
+        compute percentiles.
+
+    .. seealso::
+        :func:`.get_stats` and :func:`.disable_stats`.
+    """
+    global _stats
+    _stats = _Stats(hook=hook, samples=samples)
+
+
+def disable_stats():
+    """Stop collecting resolution statistics, and drop collected values.
+    """
+    global _stats
+    _stats = None
+
+
+def get_stats():
+    """Get a snapshot of collected resolution statistics.
+
+    The snapshot is a dict with the following keys (a key is missing if no
+    event of that kind has been recorded):
+
+    * `calls`: Number of calls per location name.
+    * `latency`: Total time, and 50th, 90th and 99th percentile of call
+      latency in seconds, per location name.
+    * `cache`: Cache `hit` and `miss` counts.
+    * `fallback`: Number of times a fallback is used, e.g. when
+      `XDG_RUNTIME_DIR` is not set.
+    * `fs`: Number of file system operations, e.g. `stat` and `open`.
+    * `persistent`: Persistent cache `hit` and `miss` counts. See
+      :func:`.enable_persistent_cache`.
+
+    An empty dict is returned if statistics are not enabled.
+
+    .. seealso::
+        :func:`.enable_stats`.
+    """
+    stats = _stats
+    if stats is None:
+        return {}
+    return stats.snapshot()
+
+
+def _to_paths(name, value):
+    """Convert a string result of `name` to path objects.
+    """
+    import pathlib
+    if name == 'get_writable_path':
+        return pathlib.Path(value)
+    return [pathlib.Path(path_str) for path_str in value]
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'size'])
+CacheInfo.__doc__ = """Statistics of the resolution cache.
+
+.. seealso::
+    :func:`.get_cache_info`.
+"""
+
+
+class _ResolutionCache(object):
+    """Memoize resolved paths.
+
+    Entries are keyed on the lookup kind, the location, and the config. The
+    whole cache is dropped whenever the environment fingerprint changes. At
+    most `maxsize` entries are kept; the least recently used ones are dropped
+    first.
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._fingerprint = None
+        # Incremented on invalidation, so results resolved concurrently with
+        # an invalidation are not cached.
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _get_key(self, name, location, config, as_str):
+        effective = get_config() if config is None else config
+        return (name, location, effective, as_str)
+
+    def peek(self, implementation, name, location, config, as_str=False):
+        """Get a cached value without resolving, or `None` if not cached.
+        """
+        if location in getattr(implementation, 'UNCACHED_LOCATIONS', ()):
+            return None
+        key = self._get_key(name, location, config, as_str)
+        fingerprint = _get_environ_fingerprint()
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                return None
+            try:
+                value = self._entries[key]
+            except KeyError:
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def lookup(self, implementation, name, location, config, as_str=False):
+        stats = _stats
+        if stats is None:
+            return self._lookup(implementation, name, location, config, as_str)
+        start = time.perf_counter()
+        try:
+            return self._lookup(implementation, name, location, config, as_str)
+        finally:
+            stats.record_call(location.name, time.perf_counter() - start)
+
+    def _lookup(self, implementation, name, location, config, as_str):
+        if location in getattr(implementation, 'UNCACHED_LOCATIONS', ()):
+            return _call_backend(
+                implementation, name, location, config, as_str,
+            )
+
+        key = self._get_key(name, location, config, as_str)
+        fingerprint = _get_environ_fingerprint()
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._entries.clear()
+                self._fingerprint = fingerprint
+            generation = self._generation
+            try:
+                value = self._entries[key]
+            except KeyError:
+                value = None
+            else:
+                self._entries.move_to_end(key)
+            if value is None and not as_str:
+                # Derive from the string result, if cached.
+                value = self._entries.get(key[:3] + (True,))
+                if value is not None:
+                    value = _to_paths(name, value)
+                    self._store(key, value)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if value is not None:
+            _record('cache', 'hit')
+            return value
+        _record('cache', 'miss')
+
+        persistent = _persistent_cache
+        if persistent is not None:
+            value = self._load_persistent(
+                persistent, implementation, key, fingerprint, generation,
+            )
+            if value is not None:
+                return value
+
+        # Resolve outside of the lock. Errors are not cached.
+        value = _call_backend(implementation, name, location, config, as_str)
+        with self._lock:
+            if (fingerprint, generation) == (
+                    self._fingerprint, self._generation):
+                self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        """Add an entry, dropping the least recently used ones if the cache
+        is full. The lock must be held.
+        """
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def _load_persistent(self, persistent, implementation, key, fingerprint,
+                         generation):
+        """Fill entries of a config from the persistent cache, and return the
+        value for `key`, or `None` if it is not stored.
+        """
+        name, location, config, as_str = key
+        table = persistent.load(implementation, config)
+        if table is None:
+            return None
+        entries = {}
+        for stored_location, (path, paths) in table.items():
+            if path is not None:
+                entries[
+                    ('get_writable_path', stored_location, config, True)
+                ] = path
+            entries[
+                ('get_standard_paths', stored_location, config, True)
+            ] = paths
+        value = entries.get(key[:3] + (True,))
+        if value is not None and not as_str:
+            value = entries[key] = _to_paths(name, value)
+        with self._lock:
+            if (fingerprint, generation) == (
+                    self._fingerprint, self._generation):
+                for entry_key, entry_value in entries.items():
+                    if entry_key not in self._entries:
+                        self._store(entry_key, entry_value)
+        return value
+
+    def discard(self, locations):
+        """Drop cached entries of `locations`.
+
+        Lookups in progress are not cached, since they may have been resolved
+        before the change that triggered this.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k[1] in locations]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._fingerprint = None
+            self._hits = 0
+            self._misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._entries))
+
+
+_cache = _ResolutionCache()
+
+# The active persistent cache. None if disabled. See the persistent module.
+_persistent_cache = None
+
+
+def clear_cache():
+    """Drop all cached resolution results, and reset cache statistics.
+
+    Results are cached automatically, and invalidated when relevant
+    environment variables (e.g. `HOME` and `XDG_*`) change. You only need to
+    call this if some other input changes, such as a platform setting.
+
+    .. seealso::
+        :func:`.get_cache_info`.
     """
-    module_name = {
-        'Darwin': '..osx',
-        'Windows': '..windows',
-    }.get(platform.system(), '..unix')
+    _cache.clear()
+    _ensured_dirs.clear()
+
+
+def get_cache_info():
+    """Get hit and miss statistics of the resolution cache.
+
+    :rtype: :class:`.CacheInfo`
+    """
+    return _cache.info()
+
+
+# Directories created or found by ensure_dirs() in this process, as
+# (file system, path) pairs.
+_ensured_dirs = set()
+
+
+def _is_dir(filesystem, path_str):
+    _record('fs', 'stat')
+    try:
+        return stat.S_ISDIR(filesystem.stat(path_str).st_mode)
+    except OSError:
+        return False
+
+
+def _make_dir(filesystem, path_str, mode):
+    """Create a directory and missing parents, like :func:`os.makedirs`.
+
+    Parents are only looked at if the directory cannot be created, and it is
+    not an error if the directory is created concurrently.
+    """
+    _record('fs', 'mkdir')
+    try:
+        filesystem.mkdir(path_str, mode)
+    except FileNotFoundError:
+        parent = os.path.dirname(path_str)
+        if parent == path_str or (filesystem, parent) in _ensured_dirs:
+            raise
+        _make_dir(filesystem, parent, 0o777)
+        _ensured_dirs.add((filesystem, parent))
+        _make_dir(filesystem, path_str, mode)
+    except FileExistsError:
+        if not _is_dir(filesystem, path_str):
+            raise
+
+
+def ensure_dirs(locations, config=None, mode=0o777):
+    """Resolve writable paths of locations, and create the directories if they
+    do not exist.
+
+    Directories are created parents first, so a parent shared by multiple
+    locations is only checked once. Directories ensured in this process are
+    remembered, and not checked again until :func:`.clear_cache` is called.
+    The directory of :attr:`.Location.runtime` is always created with mode
+    `0o700`. Directories are created through the active file system (see
+    :func:`.set_filesystem`).
+
+    :returns: A dict mapping each location to its (existing) directory.
+    :raises LocationError: If a location cannot be determined, or its
+        directory cannot be created.
+
+    .. seealso::
+        :func:`.get_writable_path`.
+    """
+    from .filesystem import get_filesystem
+    filesystem = get_filesystem()
+    implementation = _get_implementation()
+    results = collections.OrderedDict()
+    for location in locations:
+        if not isinstance(location, Location):
+            location = Location[str(location)]
+        results[location] = _cache.lookup(
+            implementation, 'get_writable_path', location, config,
+        )
+
+    modes = {}
+    for location, path in results.items():
+        path_str = str(path)
+        if location == Location.runtime:
+            modes[path_str] = 0o700
+        else:
+            modes.setdefault(path_str, mode)
+    # Parents first, so they are known to exist when children are created.
+    for path_str in sorted(modes, key=lambda ps: ps.count(os.sep)):
+        if (filesystem, path_str) in _ensured_dirs:
+            continue
+        if not _is_dir(filesystem, path_str):
+            try:
+                _make_dir(filesystem, path_str, modes[path_str])
+            except OSError as e:
+                raise LocationError(
+                    "Could not create directory '{path}': {error}".format(
+                        path=path_str, error=str(e),
+                    ),
+                )
+        _ensured_dirs.add((filesystem, path_str))
+    return results
+
+
+# Built-in backends, mapped to their module names.
+_BUILTIN_BACKENDS = {
+    'osx': '..osx',
+    'unix': '..unix',
+    'windows': '..windows',
+}
+
+BACKEND_ENTRY_POINT_GROUP = 'standardpaths.backends'
+
+# Backends registered with register_backend(). These take precedence over
+# entry points, which in turn take precedence over built-in backends.
+_registered_backends = {}
+_entry_point_backends = None
+
+# The active backend. This is resolved on first use.
+_backend = None
+
+
+def _may_have_entry_points(group):
+    """Check whether any distribution on `sys.path` may declare entry points
+    in `group`, without importing :mod:`importlib.metadata`, which is slow.
+    Returns `True` if this cannot be determined cheaply.
+    """
+    header = '[{}]'.format(group)
+    for entry in sys.path:
+        try:
+            names = os.listdir(entry or '.')
+        except NotADirectoryError:
+            return True     # A zip file.
+        except OSError:
+            continue
+        for name in names:
+            if not name.endswith(('.dist-info', '.egg-info')):
+                continue
+            try:
+                with open(os.path.join(entry, name, 'entry_points.txt')) as f:
+                    if header in f.read():
+                        return True
+            except OSError:
+                continue
+    return False
+
+
+def _get_entry_point_backends():
+    global _entry_point_backends
+    if _entry_point_backends is not None:
+        return _entry_point_backends
+    if not _may_have_entry_points(BACKEND_ENTRY_POINT_GROUP):
+        _entry_point_backends = {}
+        return _entry_point_backends
+    backends = {}
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:     # Python < 3.8.
+        pass
+    else:
+        eps = entry_points()
+        if hasattr(eps, 'select'):
+            eps = eps.select(group=BACKEND_ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(BACKEND_ENTRY_POINT_GROUP, ())
+        for ep in eps:
+            backends[ep.name] = ep
+    _entry_point_backends = backends
+    return backends
+
+
+def _load_backend(name):
+    try:
+        return _registered_backends[name]
+    except KeyError:
+        pass
+    try:
+        ep = _get_entry_point_backends()[name]
+    except KeyError:
+        pass
+    else:
+        return ep.load()
+    try:
+        module_name = _BUILTIN_BACKENDS[name]
+    except KeyError:
+        raise LookupError('Unknown backend {!r}'.format(name))
     return importlib.import_module(module_name, package=__name__)
+
+
+def _get_default_backend_name():
+    if sys.platform == 'darwin':
+        return 'osx'
+    if sys.platform == 'win32':
+        return 'windows'
+    return 'unix'
+
+
+def register_backend(name, backend):
+    """Register a backend under a name, so it can be activated with
+    :func:`.set_backend`.
+
+    A backend is a module (or any object) providing `get_writable_path`,
+    `get_standard_paths`, and `resolve_many` functions, with the same
+    signatures as the public functions, except that `location` is always a
+    :class:`.Location`. Backends can also be registered with entry points in
+    the `standardpaths.backends` group. Registering a backend under the name
+    of a built-in backend (`unix`, `osx`, or `windows`) replaces it.
+    """
+    _registered_backends[name] = backend
+
+
+def set_backend(backend):
+    """Set the backend used for path resolution.
+
+    `backend` can be either the name of a registered backend, or a backend
+    object. Pass `None` to use the default backend for the current platform.
+
+    .. seealso::
+        :func:`.register_backend`.
+    """
+    global _backend
+    if backend is None:
+        backend = _load_backend(_get_default_backend_name())
+    elif isinstance(backend, str):
+        backend = _load_backend(backend)
+    for name in ('get_writable_path', 'get_standard_paths', 'resolve_many'):
+        if not hasattr(backend, name):
+            raise TypeError('Backend {!r} does not provide {}()'.format(
+                backend, name,
+            ))
+    _backend = backend
+    _cache.clear()
+
+
+def get_backend():
+    """Get the backend used for path resolution.
+
+    .. seealso::
+        :func:`.set_backend`.
+    """
+    return _get_implementation()
+
+
+def _get_implementation():
+    """Get the active backend, resolving the default one on first use.
+    """
+    backend = _backend
+    if backend is None:
+        set_backend(None)
+        backend = _backend
+    return backend
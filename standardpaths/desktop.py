@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Catalogue of desktop entries (`.desktop` files) in the standard paths of
+:attr:`.Location.applications`, following the Desktop Entry Specification.
+
+Parsed entries are stored in an index under :attr:`.Location.generic_cache`,
+so later processes only re-parse directories that changed.
+"""
+
+import collections
+import os
+import stat
+import threading
+
+from . import Location, LocationError, get_standard_paths, get_writable_path
+from .persistent import _read_json, _write_json
+
+__all__ = ['DesktopEntry', 'get_desktop_entries']
+
+
+INDEX_VERSION = 1
+
+DesktopEntry = collections.namedtuple('DesktopEntry', ['id', 'path', 'values'])
+DesktopEntry.__doc__ = """An entry in the desktop entry catalogue.
+
+`id` is the desktop file ID, e.g. `kde4-konsole.desktop` for a file at
+`kde4/konsole.desktop` in an applications directory. `path` is the path of
+the file, as a string. `values` is a dict of keys in the `[Desktop Entry]`
+group, with values as they appear in the file.
+"""
+
+
+def _parse(path_str):
+    """Parse the `[Desktop Entry]` group of a file, or return `None` if the
+    file cannot be read or has no such group.
+    """
+    try:
+        with open(path_str, encoding='utf-8', errors='replace') as f:
+            content = f.read()
+    except OSError:
+        return None
+    values = None
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('['):
+            if values is not None:
+                break
+            if line == '[Desktop Entry]':
+                values = {}
+            continue
+        if values is None:
+            continue
+        key, sep, value = line.partition('=')
+        if sep:
+            values.setdefault(key.strip(), value.strip())
+    return values
+
+
+def _scan(path_str):
+    """List a directory, returning `(files, subdirectories)`, or `None` if it
+    cannot be listed.
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path_str) as it:
+            for entry in it:
+                if entry.name.endswith('.desktop'):
+                    if entry.is_file():
+                        files.append(entry.name)
+                elif entry.is_dir():
+                    subdirs.append(entry.name)
+    except OSError:
+        return None
+    return (sorted(files), sorted(subdirs))
+
+
+def _is_valid(record, st):
+    try:
+        return record['mtime_ns'] == st.st_mtime_ns
+    except (KeyError, TypeError):
+        return False
+
+
+class _Index(object):
+    """Parsed directories, keyed by path. Each record holds the directory's
+    mtime, parsed entries by file name, and names of subdirectories.
+    """
+    def __init__(self):
+        self.path = None
+        self.records = {}
+        self._lock = threading.Lock()
+
+    def _get_path(self):
+        path = get_writable_path(Location.generic_cache, as_str=True)
+        uid = os.geteuid() if hasattr(os, 'geteuid') else 0
+        return os.path.join(
+            path, 'standardpaths', 'desktop-entries-{}.json'.format(uid),
+        )
+
+    def _load(self, path_str):
+        if path_str == self.path:
+            return
+        data = _read_json(path_str)
+        records = {}
+        if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+            records = data.get('directories')
+            if not isinstance(records, dict):
+                records = {}
+        self.path = path_str
+        self.records = records
+
+    def _refresh(self, roots, workers):
+        """Bring records of `roots` and their subdirectories up to date.
+
+        :returns: Records of the visited directories (`None` for those that
+            cannot be listed), and whether any record was rebuilt.
+        """
+        visited = collections.OrderedDict()
+        identities = set()
+        pending = []
+        rebuilt = False
+        stack = list(reversed(roots))
+        while stack:
+            path_str = stack.pop()
+            if path_str in visited:
+                continue
+            visited[path_str] = None
+            try:
+                st = os.stat(path_str)
+            except OSError:
+                continue
+            # Skip directories already visited through another path. This
+            # also stops symbolic link loops.
+            identity = (st.st_dev, st.st_ino)
+            if not stat.S_ISDIR(st.st_mode) or identity in identities:
+                continue
+            identities.add(identity)
+            record = self.records.get(path_str)
+            if not _is_valid(record, st):
+                scanned = _scan(path_str)
+                if scanned is None:
+                    continue
+                files, subdirs = scanned
+                rebuilt = True
+                record = {
+                    'mtime_ns': st.st_mtime_ns, 'entries': {},
+                    'subdirs': subdirs,
+                }
+                pending.extend(
+                    (record, name, os.path.join(path_str, name))
+                    for name in files
+                )
+            visited[path_str] = record
+            stack.extend(
+                os.path.join(path_str, name)
+                for name in reversed(record['subdirs'])
+            )
+
+        file_strs = [file_str for _, _, file_str in pending]
+        if len(file_strs) > 1 and workers and workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(_parse, file_strs))
+        else:
+            parsed = [_parse(file_str) for file_str in file_strs]
+        for (record, name, _), values in zip(pending, parsed):
+            if values is not None:
+                record['entries'][name] = values
+        return visited, rebuilt
+
+    def get_entries(self, roots, workers, persist):
+        with self._lock:
+            index_path = None
+            if persist:
+                try:
+                    index_path = self._get_path()
+                except LocationError:
+                    pass
+                else:
+                    self._load(index_path)
+            visited, rebuilt = self._refresh(roots, workers)
+            records = {
+                path_str: record for path_str, record in visited.items()
+                if record is not None
+            }
+            # Also write if directories are gone, to drop their records.
+            changed = rebuilt or records.keys() != self.records.keys()
+            self.records = records
+            if index_path is not None and changed:
+                _write_json(index_path, {
+                    'version': INDEX_VERSION, 'directories': self.records,
+                })
+            return _collect(roots, self.records)
+
+
+def _collect(roots, records):
+    """Build the catalogue from records, applying shadowing rules.
+    """
+    entries = collections.OrderedDict()
+    shadowed = set()
+    for root in roots:
+        stack = [(root, '')]
+        while stack:
+            path_str, prefix = stack.pop()
+            record = records.get(path_str)
+            if record is None:
+                continue
+            for name in sorted(record['entries']):
+                desktop_id = prefix + name
+                if desktop_id in entries or desktop_id in shadowed:
+                    continue
+                values = record['entries'][name]
+                if values.get('Hidden') == 'true':
+                    # Hidden entries are treated as deleted, and hide entries
+                    # of lower priority.
+                    shadowed.add(desktop_id)
+                    continue
+                entries[desktop_id] = DesktopEntry(
+                    desktop_id, os.path.join(path_str, name), values,
+                )
+            stack.extend(
+                (os.path.join(path_str, name), prefix + name + '-')
+                for name in reversed(record['subdirs'])
+            )
+    return entries
+
+
+_index = _Index()
+
+
+def get_desktop_entries(paths=None, workers=None, index=True):
+    """Get desktop entries in the applications directories.
+
+    Directories are scanned recursively. If multiple directories contain an
+    entry with the same desktop file ID, the one in the directory of highest
+    priority is used. Entries with `Hidden=true` are left out, together with
+    entries of the same ID in directories of lower priority.
+
+    Parsed entries are kept in an index file under
+    :attr:`.Location.generic_cache`. A directory is only parsed again if its
+    modification time changes, i.e. when a file in it is added, removed or
+    replaced. Files modified in place are not noticed.
+
+    :param paths: Directories to look in, sorted from high to low priority.
+        Defaults to standard paths of :attr:`.Location.applications`.
+    :param workers: If given, files are parsed in parallel, with this many
+        threads.
+    :param index: Whether to read and write the index file. Parsed entries
+        are cached in the process either way.
+    :returns: A dict mapping desktop file IDs to :class:`DesktopEntry`, in
+        order of priority.
+    """
+    if paths is None:
+        roots = get_standard_paths(Location.applications, as_str=True)
+    else:
+        roots = [str(path) for path in paths]
+    roots = list(collections.OrderedDict.fromkeys(roots))
+    return _index.get_entries(roots, workers, index)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""File system access used during path resolution.
+
+Backends access the file system through the active file system object
+instead of calling :mod:`os` directly. This makes it possible to resolve
+against an in-memory file system in tests and benchmarks, and to count the
+operations a resolution performs.
+"""
+
+import collections
+import contextlib
+import os
+import posixpath
+import stat
+
+from .base import _cache
+
+__all__ = [
+    'CountingFileSystem', 'MemoryFileSystem', 'RealFileSystem',
+    'get_filesystem', 'set_filesystem',
+]
+
+
+class RealFileSystem(object):
+    """Access the real file system with :mod:`os`.
+    """
+    def stat(self, path):
+        return os.stat(path)
+
+    def lstat(self, path):
+        return os.lstat(path)
+
+    def access(self, path, mode):
+        """Check access to a path with the process's effective IDs.
+        """
+        if os.access in os.supports_effective_ids:
+            return os.access(path, mode, effective_ids=True)
+        return os.access(path, mode)
+
+    def mkdir(self, path, mode=0o777):
+        os.mkdir(path, mode)
+
+    def read_text(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def open_dir(self, path):
+        """Open a directory, and return a handle to it. A symbolic link at
+        `path` is not followed.
+        """
+        flags = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+        return os.open(path, flags | getattr(os, 'O_NOFOLLOW', 0))
+
+    def fstat(self, handle):
+        return os.fstat(handle)
+
+    def fchmod(self, handle, mode):
+        os.fchmod(handle, mode)
+
+    def close(self, handle):
+        os.close(handle)
+
+
+StatResult = collections.namedtuple('StatResult', [
+    'st_mode', 'st_ino', 'st_dev', 'st_uid', 'st_size', 'st_mtime_ns',
+])
+
+
+class _Node(object):
+
+    def __init__(self, mode, uid, ino, mtime_ns, content=None):
+        self.mode = mode
+        self.uid = uid
+        self.ino = ino
+        self.mtime_ns = mtime_ns
+        self.content = content
+
+    def stat(self):
+        size = 0 if self.content is None else len(self.content)
+        return StatResult(
+            self.mode, self.ino, 0, self.uid, size, self.mtime_ns,
+        )
+
+
+class MemoryFileSystem(object):
+    """An in-memory POSIX file system, for fast hermetic tests.
+
+    The file system starts with an empty root directory. Use :meth:`add_dir`
+    and :meth:`add_file` to populate it. Modification times come from a
+    counter that increases on every change, so changes are always visible in
+    stat results.
+
+    :param uid: The owner of created entries. Defaults to the process's
+        effective user ID.
+    """
+    def __init__(self, uid=None):
+        if uid is None:
+            uid = os.geteuid()
+        self.uid = uid
+        self._last_inode = 0
+        self._last_mtime_ns = 0
+        self._nodes = {'/': self._make_node(stat.S_IFDIR | 0o755, uid)}
+
+    def _tick(self):
+        self._last_mtime_ns += 1
+        return self._last_mtime_ns
+
+    def _make_node(self, mode, uid, content=None):
+        self._last_inode += 1
+        return _Node(mode, uid, self._last_inode, self._tick(), content)
+
+    def _touch_parent(self, path):
+        self._nodes[posixpath.dirname(path)].mtime_ns = self._tick()
+
+    def _get_node(self, path):
+        try:
+            return self._nodes[posixpath.normpath(path)]
+        except KeyError:
+            raise FileNotFoundError(2, 'No such file or directory', path)
+
+    def _check_parent(self, path):
+        parent = self._get_node(posixpath.dirname(path))
+        if not stat.S_ISDIR(parent.mode):
+            raise NotADirectoryError(20, 'Not a directory', path)
+
+    def add_dir(self, path, mode=0o755, uid=None):
+        """Create a directory, including missing parents.
+        """
+        path = posixpath.normpath(path)
+        parent = posixpath.dirname(path)
+        if parent not in self._nodes:
+            self.add_dir(parent, uid=uid)
+        if path not in self._nodes:
+            self._nodes[path] = self._make_node(
+                stat.S_IFDIR | mode, self.uid if uid is None else uid,
+            )
+            self._touch_parent(path)
+
+    def add_file(self, path, content='', mode=0o644, uid=None):
+        """Create or replace a file, including missing parent directories.
+        """
+        path = posixpath.normpath(path)
+        self.add_dir(posixpath.dirname(path))
+        self._nodes[path] = self._make_node(
+            stat.S_IFREG | mode, self.uid if uid is None else uid, content,
+        )
+        self._touch_parent(path)
+
+    def remove(self, path):
+        path = posixpath.normpath(path)
+        self._get_node(path)
+        prefix = path.rstrip('/') + '/'
+        for key in [k for k in self._nodes if k.startswith(prefix)]:
+            del self._nodes[key]
+        del self._nodes[path]
+        self._touch_parent(path)
+
+    def stat(self, path):
+        return self._get_node(path).stat()
+
+    def lstat(self, path):
+        # There are no symbolic links in memory.
+        return self.stat(path)
+
+    def access(self, path, mode):
+        """Check access with owner or other permission bits. Group bits are
+        ignored.
+        """
+        try:
+            node = self._get_node(path)
+        except FileNotFoundError:
+            return False
+        if mode == os.F_OK or self.uid == 0:
+            return True
+        bits = (mode & 0o7) << 6 if node.uid == self.uid else mode & 0o7
+        return node.mode & bits == bits
+
+    def mkdir(self, path, mode=0o777):
+        path = posixpath.normpath(path)
+        if path in self._nodes:
+            raise FileExistsError(17, 'File exists', path)
+        self._check_parent(path)
+        self._nodes[path] = self._make_node(stat.S_IFDIR | mode, self.uid)
+        self._touch_parent(path)
+
+    def read_text(self, path):
+        node = self._get_node(path)
+        if stat.S_ISDIR(node.mode):
+            raise IsADirectoryError(21, 'Is a directory', path)
+        return node.content
+
+    def open_dir(self, path):
+        node = self._get_node(path)
+        if not stat.S_ISDIR(node.mode):
+            raise NotADirectoryError(20, 'Not a directory', path)
+        return node
+
+    def fstat(self, handle):
+        return handle.stat()
+
+    def fchmod(self, handle, mode):
+        if handle.uid != self.uid:
+            raise PermissionError(1, 'Operation not permitted')
+        handle.mode = stat.S_IFMT(handle.mode) | mode
+
+    def close(self, handle):
+        pass
+
+
+class CountingFileSystem(object):
+    """Wrap a file system, counting the operations performed through it.
+
+    Counts are kept per operation name in :attr:`counts`.
+    """
+    def __init__(self, filesystem=None):
+        if filesystem is None:
+            filesystem = RealFileSystem()
+        self.filesystem = filesystem
+        self.counts = collections.Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self.filesystem, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.counts[name] += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def reset(self):
+        self.counts.clear()
+
+    @contextlib.contextmanager
+    def budget(self, limit, operation=None):
+        """Assert the wrapped block performs at most `limit` operations.
+
+        If `operation` is given, only operations of that name are counted.
+        """
+        before = self.counts.copy()
+        yield
+        used = self.counts - before
+        count = used[operation] if operation else sum(used.values())
+        if count > limit:
+            raise AssertionError(
+                'Expected at most {} operation(s), {} performed: {}'.format(
+                    limit, count, dict(used),
+                ),
+            )
+
+
+_filesystem = RealFileSystem()
+
+
+def get_filesystem():
+    """Get the file system used for path resolution.
+    """
+    return _filesystem
+
+
+def set_filesystem(filesystem):
+    """Set the file system used for path resolution. Pass `None` to use the
+    real file system. This also clears the resolution cache.
+    """
+    global _filesystem
+    if filesystem is None:
+        filesystem = RealFileSystem()
+    _filesystem = filesystem
+    _cache.clear()
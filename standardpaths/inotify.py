@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Minimal inotify binding with :mod:`ctypes`, used to invalidate cached
+results when files they depend on change. Linux only.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import functools
+import operator
+import os
+import select
+import struct
+import threading
+
+__all__ = ['Watcher']
+
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+# Events on a directory's entries that may change an entry, or the entry a
+# name points to.
+_MASK = functools.reduce(operator.or_, [
+    IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO,
+    IN_CREATE, IN_DELETE, IN_DELETE_SELF, IN_MOVE_SELF, IN_ONLYDIR,
+])
+
+_EVENT = struct.Struct('iIII')
+
+_libc = None
+
+
+def _get_libc():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(
+            ctypes.util.find_library('c') or 'libc.so.6', use_errno=True,
+        )
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        _libc = libc
+    return _libc
+
+
+def _iter_events(data):
+    offset = 0
+    while offset + _EVENT.size <= len(data):
+        wd, mask, _, length = _EVENT.unpack_from(data, offset)
+        offset += _EVENT.size
+        name = data[offset:offset + length].rstrip(b'\0')
+        offset += length
+        yield wd, mask, os.fsdecode(name)
+
+
+class Watcher(object):
+    """Call callbacks when paths change, from a background thread.
+
+    A path is watched through its parent directory, so creating, replacing,
+    deleting and changing metadata of the path are all noticed. If the parent
+    does not exist, the nearest existing ancestor is watched instead, and
+    callbacks are called when the missing directory is created; the caller
+    should then watch the path again.
+
+    Callbacks may be called for changes that do not affect the path (e.g.
+    when the event queue overflows), but never miss a change after
+    :meth:`watch` returns.
+
+    :raises OSError: If inotify is not available.
+    """
+    def __init__(self):
+        libc = _get_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        self._libc = libc
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self._lock = threading.Lock()
+        # Maps (watch descriptor, entry name) to a set of callbacks.
+        self._callbacks = {}
+        self._thread = threading.Thread(
+            target=self._run, name='standardpaths-inotify',
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def watch(self, path_str, callback):
+        """Call `callback` (without arguments) when `path_str` changes.
+
+        :returns: Whether the path is being watched.
+        """
+        parent, name = os.path.split(os.path.abspath(path_str))
+        while name:
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(parent), _MASK,
+            )
+            if wd >= 0:
+                with self._lock:
+                    self._callbacks.setdefault((wd, name), set()).add(
+                        callback,
+                    )
+                return True
+            if ctypes.get_errno() not in (errno.ENOENT, errno.ENOTDIR):
+                return False
+            parent, name = os.path.split(parent)
+        return False
+
+    def close(self):
+        """Stop watching, and wait for the background thread to exit.
+        """
+        os.write(self._wake_w, b'\0')
+        self._thread.join()
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+    def _run(self):
+        while True:
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._wake_r in readable:
+                return
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                continue
+            for wd, mask, name in _iter_events(data):
+                self._dispatch(wd, mask, name)
+
+    def _dispatch(self, wd, mask, name):
+        with self._lock:
+            if mask & IN_Q_OVERFLOW:
+                keys = list(self._callbacks)
+            elif name:
+                keys = [(wd, name)] if (wd, name) in self._callbacks else []
+            else:
+                # The watched directory itself changed.
+                keys = [key for key in self._callbacks if key[0] == wd]
+            callbacks = set()
+            for key in keys:
+                callbacks.update(self._callbacks[key])
+                if mask & (IN_IGNORED | IN_Q_OVERFLOW):
+                    del self._callbacks[key]
+        for callback in callbacks:
+            callback()
@@ -12,7 +12,9 @@ import tempfile
 
 from rubicon.objc import ObjCClass
 
-from .base import Location, LocationError, _append_org_and_app
+from .base import (
+    Location, LocationError, _append_org_and_app, _resolve_many,
+)
 
 
 class FSRef(ctypes.Structure):
@@ -29,8 +31,19 @@ def _bti(bs):
     return sum(b * (2 ** (i * 8)) for b, i in zip(rbs, range(len(bs))))
 
 
+_libraries = {}
+
+
 def _load(name):
-    return ctypes.cdll.LoadLibrary(ctypes.util.find_library(name))
+    # find_library() is expensive, so only do it once per library.
+    try:
+        return _libraries[name]
+    except KeyError:
+        pass
+    library = _libraries[name] = ctypes.cdll.LoadLibrary(
+        ctypes.util.find_library(name),
+    )
+    return library
 
 
 # CoreServices/CarbonCore/Folders.h
@@ -139,11 +152,8 @@ def get_writable_path(location, config=None):
     return _get_path(location, domain, config)
 
 
-def get_standard_paths(location, config=None):
-    try:
-        paths = [get_writable_path(location, config)]
-    except LocationError:
-        paths = []
+def _get_standard_paths(location, config, path):
+    paths = [] if path is None else [path]
     if location in (
             Location.generic_data, Location.app_data, Location.app_local_data,
             Location.generic_cache, Location.cache,):
@@ -159,3 +169,17 @@ def get_standard_paths(location, config=None):
     # TODO: Support this if applicable?
 
     return paths
+
+
+def get_standard_paths(location, config=None):
+    try:
+        path = get_writable_path(location, config)
+    except LocationError:
+        path = None
+    return _get_standard_paths(location, config, path)
+
+
+def resolve_many(locations, config=None):
+    return _resolve_many(
+        locations, config, get_writable_path, _get_standard_paths,
+    )
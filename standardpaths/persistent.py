@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Persistent resolution cache, shared across process starts.
+
+Resolved paths are stored in a JSON file together with a fingerprint of
+everything they are derived from. A process loads the table if the
+fingerprint still matches, instead of resolving each location again.
+"""
+
+import os
+import threading
+
+from . import base, filesystem
+from .base import (
+    Location, LocationError,
+    _get_environ_values, _get_logger, _record,
+)
+
+__all__ = ['disable_persistent_cache', 'enable_persistent_cache']
+
+
+FORMAT_VERSION = 1
+
+
+def _get_fingerprint(implementation):
+    """Get a string that changes whenever resolution results may change.
+    """
+    import json
+    from . import __version__
+    return json.dumps([
+        FORMAT_VERSION, __version__,
+        getattr(implementation, '__name__', type(implementation).__name__),
+        type(filesystem.get_filesystem()).__name__,
+        os.geteuid() if hasattr(os, 'geteuid') else None,
+        _get_environ_values(),
+    ])
+
+
+def _get_config_key(config):
+    return '{}\0{}'.format(config.organization_name, config.application_name)
+
+
+def _read_json(path_str):
+    """Read a JSON file, or return `None` if it cannot be read.
+    """
+    import json
+    _record('fs', 'open')
+    try:
+        with open(path_str) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path_str, data):
+    """Write a JSON file atomically, so readers never see a partial file.
+    Errors are logged and ignored.
+    """
+    import json
+    temp = '{}.{}.tmp'.format(path_str, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path_str), exist_ok=True)
+        with open(temp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp, path_str)
+    except OSError as e:
+        _get_logger().debug('Could not write {}: {}'.format(path_str, e))
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+
+
+class _PersistentCache(object):
+    """Tables of resolved paths (as strings) per config, backed by a file.
+
+    A table maps locations to `(writable_path, standard_paths)` pairs, where
+    `writable_path` is `None` if it cannot be determined.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _get_path(self, implementation):
+        if self.path is None:
+            path = implementation.get_writable_path(
+                location=Location.generic_cache, config=base.Config(),
+            )
+            uid = os.geteuid() if hasattr(os, 'geteuid') else 0
+            self.path = os.path.join(
+                str(path), 'standardpaths', 'resolved-{}.json'.format(uid),
+            )
+        return self.path
+
+    def _resolve(self, implementation, config):
+        excluded = getattr(
+            implementation, 'UNCACHED_LOCATIONS', frozenset(),
+        ) | getattr(implementation, 'UNPERSISTED_LOCATIONS', frozenset())
+        locations = [
+            location for location in Location
+            if location not in excluded and location != Location.runtime
+        ]
+        results = base._resolve_many_with(
+            implementation, locations, config, True,
+        )
+        return {
+            location: (path, list(paths))
+            for location, (path, paths) in results.items()
+        }
+
+    def load(self, implementation, config):
+        """Get the table for `config`, resolving and storing it if the stored
+        table is missing or outdated. `None` is returned if the location of
+        the file cannot be determined.
+        """
+        fingerprint = _get_fingerprint(implementation)
+        memo_key = (fingerprint, config)
+        try:
+            return self._tables[memo_key]
+        except KeyError:
+            pass
+        with self._lock:
+            try:
+                path_str = self._get_path(implementation)
+            except LocationError:
+                return None
+            data = _read_json(path_str)
+            if not data or data.get('fingerprint') != fingerprint:
+                data = {'fingerprint': fingerprint, 'configs': {}}
+            config_key = _get_config_key(config)
+            try:
+                stored = data['configs'][config_key]
+                table = {
+                    Location[name]: (path, paths)
+                    for name, (path, paths) in stored.items()
+                }
+            except (KeyError, TypeError, ValueError):
+                _record('persistent', 'miss')
+                table = self._resolve(implementation, config)
+                data['configs'][config_key] = {
+                    location.name: value for location, value in table.items()
+                }
+                _write_json(path_str, data)
+            else:
+                _record('persistent', 'hit')
+            self._tables[memo_key] = table
+        return table
+
+
+def enable_persistent_cache(path=None):
+    """Store resolution results on disk, and reuse them in later processes.
+
+    This is useful for short-lived programs, such as command line tools. The
+    stored results are discarded if the library version, the backend, the user,
+    or any relevant environment variable changes. Locations read from files
+    (e.g. user directories from `user-dirs.dirs`) are not stored.
+
+    :param path: The file to store results in. Defaults to a file in the
+        `standardpaths` directory under :attr:`.Location.generic_cache`.
+
+    .. note::
+        Results derived from platform settings (e.g. known folders on
+        Windows) are not re-checked while the stored results are valid. Call
+        :func:`.disable_persistent_cache` with `remove=True` after changing
+        such settings.
+    """
+    base._persistent_cache = _PersistentCache(path)
+    base._cache.clear()
+
+
+def disable_persistent_cache(remove=False):
+    """Stop using the persistent cache.
+
+    :param remove: Also delete the file storing results.
+    """
+    persistent = base._persistent_cache
+    base._persistent_cache = None
+    base._cache.clear()
+    if remove and persistent is not None:
+        path_str = persistent._get_path(base._get_implementation())
+        try:
+            os.unlink(path_str)
+        except OSError:
+            pass
@@ -1,13 +1,348 @@
-# TODO: Implement me.
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
 
+"""Tools to look for files in standard locations. Based on the `locate` and
+`findExecutable` functions in `qstandardpaths.cpp`.
+"""
 
-# def locate(location, filename, options):
-#     pass
+import collections
+import enum
+import os
+import pathlib
+import stat
+import time
 
+from . import Location, get_standard_paths
 
-# def locate_all(location, filename, options):
-#     pass
 
+class LocateOption(enum.Enum):
+    """Describe what :func:`.locate` and :func:`.locate_all` look for.
+    """
 
-# def find_executable(name, paths):
-#     pass
+    file = 0
+    """Only match regular files.
+    """
+
+    directory = 1
+    """Only match directories.
+    """
+
+
+class _DirectoryIndex(object):
+    """Cached listings of directories.
+
+    A listing maps entry names (normalized by `key`) to whatever `scan`
+    returns for the entry, skipping entries mapped to `None`. Listings are
+    validated against the directory's mtime on every lookup, so a lookup
+    costs one `stat` instead of one per candidate.
+    """
+    def __init__(self, scan, key=None):
+        self._scan = scan
+        self._key = key
+        self._entries = {}
+
+    def _build(self, path_str):
+        """Build the listing of a directory, or `None` if it cannot be listed.
+        """
+        try:
+            st = os.stat(path_str)
+            with os.scandir(path_str) as it:
+                listing = {}
+                for entry in it:
+                    value = self._scan(entry)
+                    if value is None:
+                        continue
+                    if self._key is None:
+                        listing[entry.name] = value
+                    else:
+                        listing[self._key(entry.name)] = value
+        except OSError:
+            return (None, None)
+        return (st.st_mtime_ns, listing)
+
+    def get(self, path_str):
+        """Get the listing of a directory, or `None` if it does not exist.
+        """
+        try:
+            mtime_ns, listing = self._entries[path_str]
+        except KeyError:
+            pass
+        else:
+            try:
+                st = os.stat(path_str)
+            except OSError:
+                st = None
+            if st is not None and st.st_mtime_ns == mtime_ns:
+                return listing
+        mtime_ns, listing = self._build(path_str)
+        self._entries[path_str] = (mtime_ns, listing)
+        return listing
+
+    def prefetch(self, path_strs, workers):
+        """Build listings of directories not indexed yet, in parallel.
+        """
+        path_strs = [ps for ps in path_strs if ps not in self._entries]
+        if len(path_strs) < 2 or not workers or workers < 2:
+            return
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self._build, path_strs)
+            for path_str, result in zip(path_strs, results):
+                self._entries[path_str] = result
+
+    def clear(self):
+        self._entries.clear()
+
+
+def _scan_file_or_directory(entry):
+    if entry.is_dir():
+        return LocateOption.directory
+    if entry.is_file():
+        return LocateOption.file
+    return None
+
+
+_locate_index = _DirectoryIndex(_scan_file_or_directory)
+
+
+def _iter_located(location, filename, options, config, workers):
+    normalized = os.path.normpath(filename)
+    if os.path.isabs(normalized) or os.pardir in normalized.split(os.sep):
+        raise ValueError(
+            'Expected a relative path inside the location, got {!r}'.format(
+                str(filename),
+            ),
+        )
+    parent, name = os.path.split(normalized)
+    if not name:
+        return
+    candidates = [
+        (path, os.path.join(str(path), parent) if parent else str(path))
+        for path in get_standard_paths(location, config)
+    ]
+    if workers:
+        _locate_index.prefetch([ds for _, ds in candidates], workers)
+    for path, directory in candidates:
+        listing = _locate_index.get(directory)
+        if listing is not None and listing.get(name) == options:
+            yield path / normalized
+
+
+def locate(location, filename, options=LocateOption.file, config=None,
+           workers=None):
+    """Find a file or directory called `filename` in the standard locations
+    for `location`.
+
+    Directories are searched in the order returned by
+    :func:`.get_standard_paths`. Directory listings are cached, so looking up
+    many files in the same location is cheap. A cached listing is used only
+    if the directory's modification time is unchanged, so files created or
+    removed are noticed on the next call. Changes within the timestamp
+    resolution of the file system (e.g. two seconds on FAT) may be missed.
+
+    :param workers: If given, directories that are not indexed yet are listed
+        in parallel, with this many threads.
+    :returns: The path of the first match, or `None` if nothing matches.
+    :rtype: :class:`pathlib.Path`
+    :raises ValueError: If `filename` is absolute, or refers to a parent
+        directory with `..`.
+
+    .. seealso::
+        :func:`.locate_all`.
+    """
+    for path in _iter_located(location, filename, options, config, workers):
+        return path
+    return None
+
+
+def locate_all(location, filename, options=LocateOption.file, config=None,
+               workers=None):
+    """Find all files or directories called `filename` in the standard
+    locations for `location`. Listings are cached and validated like in
+    :func:`.locate`.
+
+    :returns: A list of matched paths, sorted from high to low priority.
+    :rtype: `list` of :class:`pathlib.Path`
+
+    .. seealso::
+        :func:`.locate`.
+    """
+    return list(_iter_located(location, filename, options, config, workers))
+
+
+class _StatIndex(object):
+    """Cached identities of directories.
+
+    The identity of a path is its `(st_dev, st_ino)`, or `None` if it is not
+    an existing directory. Identities are only checked again if `interval`
+    seconds have passed since the last check.
+    """
+    def __init__(self, interval=1.0):
+        self._entries = {}
+        self.interval = interval
+
+    def _check(self, path_str):
+        try:
+            st = os.stat(path_str)
+        except (OSError, ValueError):
+            return None
+        if not stat.S_ISDIR(st.st_mode):
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def get_many(self, path_strs, workers=None):
+        """Get identities of paths, as a dict. Paths not freshly checked are
+        checked in parallel if `workers` is given.
+        """
+        now = time.monotonic()
+        results = {}
+        stale = []
+        for path_str in path_strs:
+            try:
+                validated, identity = self._entries[path_str]
+            except KeyError:
+                stale.append(path_str)
+                continue
+            if now - validated < self.interval:
+                results[path_str] = identity
+            else:
+                stale.append(path_str)
+        if len(stale) > 1 and workers and workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                identities = list(executor.map(self._check, stale))
+        else:
+            identities = [self._check(path_str) for path_str in stale]
+        for path_str, identity in zip(stale, identities):
+            self._entries[path_str] = (now, identity)
+            results[path_str] = identity
+        return results
+
+    def clear(self):
+        self._entries.clear()
+
+
+_stat_index = _StatIndex()
+
+
+def get_existing_paths(location, config=None, as_str=False, workers=None):
+    """Get the standard paths of `location` that are existing directories.
+
+    This is :func:`.get_standard_paths`, with paths that do not exist
+    removed. Paths pointing to the same directory as a path of higher priority
+    (e.g. through a symbolic link) are also removed, so each directory is
+    returned only once. Results of `stat` are cached for a short while, so
+    directories created in the meantime may not show up immediately.
+
+    :param as_str: Return paths as strings.
+    :param workers: If given, paths not checked recently are checked in
+        parallel, with this many threads. This helps with long lists on slow
+        file systems.
+    :rtype: `list` of :class:`pathlib.Path`
+    """
+    path_strs = get_standard_paths(location, config, as_str=True)
+    identities = _stat_index.get_many(path_strs, workers)
+    seen = set()
+    results = []
+    for path_str in path_strs:
+        identity = identities[path_str]
+        if identity is None or identity in seen:
+            continue
+        seen.add(identity)
+        results.append(path_str)
+    if as_str:
+        return results
+    return [pathlib.Path(path_str) for path_str in results]
+
+
+def _scan_regular_file(entry):
+    # Permissions can change without changing the directory's mtime, so they
+    # are checked when looking up, not stored in the listing.
+    try:
+        if entry.is_file():
+            return entry.name
+    except OSError:
+        pass
+    return None
+
+
+_executable_index = _DirectoryIndex(
+    _scan_regular_file, key=os.path.normcase,
+)
+
+
+def _get_executable_suffixes():
+    # Windows resolves executables without extensions with PATHEXT.
+    if os.name != 'nt':
+        return ('',)
+    pathext = os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD')
+    return ('',) + tuple(ext for ext in pathext.split(os.pathsep) if ext)
+
+
+def _get_executable_search_paths(paths):
+    if paths is None:
+        path_strs = os.environ.get('PATH', os.defpath).split(os.pathsep)
+        path_strs.extend(
+            get_standard_paths(Location.applications, as_str=True),
+        )
+    else:
+        path_strs = [str(path) for path in paths]
+    return list(collections.OrderedDict.fromkeys(ps for ps in path_strs if ps))
+
+
+def _find_executable(name, path_strs, suffixes):
+    if os.path.dirname(name):
+        for suffix in suffixes:
+            candidate = name + suffix
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return pathlib.Path(candidate)
+        return None
+    keys = [os.path.normcase(name + suffix) for suffix in suffixes]
+    for path_str in path_strs:
+        listing = _executable_index.get(path_str)
+        if not listing:
+            continue
+        for key in keys:
+            try:
+                file_str = os.path.join(path_str, listing[key])
+            except KeyError:
+                continue
+            if os.access(file_str, os.X_OK):
+                return pathlib.Path(file_str)
+    return None
+
+
+def find_executable(name, paths=None):
+    """Find an executable called `name` in `paths`.
+
+    If `paths` is `None`, directories in the `PATH` environment variable are
+    searched, followed by standard paths of :attr:`.Location.applications`.
+    Names containing a directory are checked directly. Listings of files in
+    each directory are cached, similar to the `hash` command in shells, so
+    repeated lookups only check each directory's modification time and the
+    permission of the found file.
+
+    :returns: The path of the executable, or `None` if it is not found.
+    :rtype: :class:`pathlib.Path`
+
+    .. seealso::
+        :func:`.find_executables`.
+    """
+    path_strs = _get_executable_search_paths(paths)
+    return _find_executable(name, path_strs, _get_executable_suffixes())
+
+
+def find_executables(names, paths=None):
+    """Find multiple executables in `paths`.
+
+    :returns: A dict mapping each name to the path of the executable, or
+        `None` if it is not found.
+
+    .. seealso::
+        :func:`.find_executable`.
+    """
+    path_strs = _get_executable_search_paths(paths)
+    suffixes = _get_executable_suffixes()
+    return {
+        name: _find_executable(name, path_strs, suffixes) for name in names
+    }
@@ -6,163 +6,829 @@
 """
 
 import collections
-import logging
+import functools
+import itertools
 import os
-import pathlib
-import pwd
-import re
 import stat
-import tempfile
+import sys
+import threading
 
-from .base import Location, LocationError, _append_org_and_app
+from .filesystem import RealFileSystem, get_filesystem
+from .base import (
+    Location, LocationError, get_config,
+    _ENVIRON_NAMES, _cache, _get_environ_fingerprint, _get_logger,
+    _is_plain_name, _record, _resolve_many,
+)
 
 
-logger = logging.getLogger('standardpaths')
+_USER_DIR_LOCATIONS = frozenset([
+    Location.desktop, Location.documents, Location.pictures,
+    Location.music, Location.movies, Location.download,
+])
 
-RAISE = object()
+_RUNTIME_LOCATIONS = frozenset([Location.runtime])
 
+# Locations that depend on something other than the environment, and should
+# therefore not be cached. Runtime directory resolution has side effects
+# (creating the directory and fixing its permission); user directories are
+# read from `user-dirs.dirs`, which may change at any time. This is emptied
+# while watching for changes; see start_watching().
+UNCACHED_LOCATIONS = _USER_DIR_LOCATIONS | _RUNTIME_LOCATIONS
 
-def _get_path_str(environ_name, default):
-    # http://standards.freedesktop.org/basedir-spec/latest/
-    path_str = os.getenv(environ_name, default)
-    if path_str is RAISE:
-        raise KeyError(environ_name)
+# Locations never stored by the persistent cache, even while watching, since
+# they must be looked up in each process to be watched.
+UNPERSISTED_LOCATIONS = _USER_DIR_LOCATIONS | _RUNTIME_LOCATIONS
+
+# get_writable_path(), get_standard_paths() and resolve_many() accept
+# `as_str`, and build strings without creating path objects.
+STRING_PATHS = True
+
+
+def _to_path_str(path_str):
+    """Normalize a path string like :mod:`pathlib` does, so that
+    `str(pathlib.Path(path_str)) == _to_path_str(path_str)`.
+    """
+    if not path_str or path_str[-1] in './' or path_str.startswith('./'):
+        # Possibly not canonical. Let pathlib do it.
+        import pathlib
+        return str(pathlib.PurePosixPath(path_str))
+    if '//' in path_str or '/./' in path_str:
+        import pathlib
+        return str(pathlib.PurePosixPath(path_str))
+    return path_str
+
+
+def _join(path_str, name):
+    """Join a name to a normalized path string, like `path / name`.
+    """
+    if not _is_plain_name(name):
+        import pathlib
+        return str(pathlib.PurePosixPath(path_str, name))
+    if path_str.endswith('/'):     # The root.
+        return path_str + name
+    return path_str + '/' + name
+
+
+def _append_org_and_app(path_str, config):
+    """String version of :func:`base._append_org_and_app`.
+    """
+    if config is None:
+        config = get_config()
+    if config.organization_name:
+        path_str = _join(path_str, config.organization_name)
+    if config.application_name:
+        path_str = _join(path_str, config.application_name)
     return path_str
 
 
-def _get_path(environ_name, default):
-    path_str = _get_path_str(environ_name, default)
-    return pathlib.Path(os.path.expanduser(path_str))
+# Results are memoized per environment value, since the lists can be long
+# (e.g. on NixOS), but rarely change in a process.
+@functools.lru_cache(maxsize=32)
+def _parse_dir_list(value, default):
+    """Parse a colon-separated list of directories, such as `XDG_DATA_DIRS`.
+
+    Relative and empty entries are skipped, and duplicates are removed. If
+    no entries are left, `default` is used instead.
+    """
+    if value:
+        paths = tuple(collections.OrderedDict.fromkeys(
+            os.path.normpath(ps)
+            for ps in value.split(':') if ps and os.path.isabs(ps)
+        ))
+        if paths:
+            return paths
+    return default
+
 
+@functools.lru_cache(maxsize=256)
+def _get_derived_dirs(value, default, names):
+    """Join `names` to each directory in a parsed directory list.
+    """
+    paths = _parse_dir_list(value, default)
+    if not all(_is_plain_name(name) for name in names):
+        return tuple(functools.reduce(_join, names, ps) for ps in paths)
+    suffix = '/'.join(names)
+    return tuple(
+        ps + suffix if ps.endswith('/') else ps + '/' + suffix
+        for ps in paths
+    )
 
-def _get_xdg_data_dirs():
-    xdg_data_dirs = os.getenv('XDG_DATA_DIRS')
-    if not xdg_data_dirs:
-        paths = [pathlib.Path('/usr/local/share'), pathlib.Path('usr/share')]
+
+_DEFAULT_DIRS = {
+    'XDG_CONFIG_DIRS': ('/etc/xdg',),
+    'XDG_DATA_DIRS': ('/usr/local/share', '/usr/share',),
+}
+
+
+_XDG_DIR_PATTERN = None
+
+# Parsed user-dirs.dirs files. Maps path strings to (file system, signature,
+# values).
+_user_dirs_cache = {}
+
+
+def _read_user_dirs(path, filesystem):
+    """Read `user-dirs.dirs` into a dict, e.g. `{'DESKTOP': '$HOME/Desktop'}`.
+
+    The parsed result is cached, and only re-parsed when the file's stat
+    signature changes. An empty dict is returned if the file cannot be read.
+    """
+    path_str = str(path)
+    _record('fs', 'stat')
+    try:
+        st = filesystem.stat(path_str)
+    except OSError:
+        _user_dirs_cache.pop(path_str, None)
+        _record('fallback', 'user-dirs')
+        return {}
+    signature = (st.st_mtime_ns, st.st_ino, st.st_size)
+    try:
+        cached_fs, cached_signature, values = _user_dirs_cache[path_str]
+    except KeyError:
+        pass
     else:
-        paths = list(collections.OrderedDict.fromkeys([
-            pathlib.Path(os.path.normpath(ps))
-            for ps in xdg_data_dirs.split(':') if ps and os.path.isabs(ps)
-        ]).keys())
-    return paths
-
-
-def get_writable_path(location, config=None):
-    # TODO: Make sure these fit Qt's implementation.
-    if location == Location.home:
-        return pathlib.Path(os.path.expanduser('~'))
-    if location == Location.temp:
-        return pathlib.Path(tempfile.gettempdir())
-
-    if location == Location.generic_cache:
-        return _get_path('XDG_CACHE_HOME', '~/.cache')
-    if location == Location.cache:
-        path = get_writable_path(Location.generic_cache)
-        return _append_org_and_app(path, config)
-    if location == Location.generic_data:
-        return _get_path('XDG_DATA_HOME', '~/.local/share')
-    if location in (Location.app_data, Location.app_local_data,):
-        path = get_writable_path(Location.generic_data)
-        return _append_org_and_app(path, config)
-    if location in (Location.config, Location.generic_config,):
-        return _get_path('XDG_CONFIG_HOME', '~/.config')
-    if location == Location.log:
-        # Free Desktop does not provide any suggestions on where log files
-        # should be placed, and there is no consensus in the community. Debian
-        # has a proposal for this, but nobody really does it. I'm personally in
-        # the "log files are not essential" camp, and agrees that it belongs
-        # better with cache than data.
-        # http://stackoverflow.com/a/27965014/1376863
-        return get_writable_path(Location.cache) / 'log'
-    if location == Location.runtime:
-        username = pwd.getpwuid(os.geteuid()).pw_name
+        if cached_fs is filesystem and cached_signature == signature:
+            return values
+
+    values = {}
+    _record('fs', 'open')
+    try:
+        content = filesystem.read_text(path_str)
+    except OSError:
+        _record('fallback', 'user-dirs')
+        return {}
+    global _XDG_DIR_PATTERN
+    if _XDG_DIR_PATTERN is None:
+        import re
+        _XDG_DIR_PATTERN = re.compile(r'^XDG_(.*)_DIR=(.*)\s*$')
+    for line in content.splitlines():
+        match = _XDG_DIR_PATTERN.match(line)
+        if not match:
+            continue
+        value = match.group(2).strip('"')
+        if value:
+            values.setdefault(match.group(1), value)
+    _user_dirs_cache[path_str] = (filesystem, signature, values)
+    return values
+
+
+class Resolver(object):
+    """Resolve locations from explicit inputs instead of process state.
+
+    A resolver never reads the process environment, and never modifies the
+    file system; the only file it reads is `user-dirs.dirs` under the
+    resolved config directory. Resolvers can be pickled, so results can be
+    computed in another process.
+
+    :param environ: A mapping of environment variables. Only variables
+        relevant to path resolution are kept.
+    :param home: The user's home directory.
+    :param uid: The user's ID.
+    :param tempdir: The temporary directory. If omitted, this is derived from
+        `TMPDIR`, `TEMP` or `TMP` in `environ` when first needed, defaulting
+        to `/tmp`.
+    :param filesystem: The file system to read from. If omitted, the active
+        file system (see :mod:`standardpaths.filesystem`) is used.
+
+    .. note::
+        Unlike :func:`.get_writable_path`, resolving :attr:`.Location.runtime`
+        with a resolver does not create the directory, nor check its
+        ownership and permission.
+    """
+    def __init__(self, environ, home, uid, tempdir=None, filesystem=None):
+        self.environ = {
+            name: environ[name] for name in _ENVIRON_NAMES if name in environ
+        }
+        self.home = home
+        self.uid = uid
+        self._tempdir = tempdir
+        self._tempdir_str = None
+        self._check_tempdir = False
+        self._home_str = _to_path_str(home)
+        self.filesystem = filesystem
+        self._username = None
+
+    def __repr__(self):
+        return '{}(environ={!r}, home={!r}, uid={!r})'.format(
+            type(self).__name__, self.environ, self.home, self.uid,
+        )
+
+    @classmethod
+    def for_process(cls):
+        """Create a resolver from the current process's state.
+        """
+        resolver = cls(os.environ, os.path.expanduser('~'), os.geteuid())
+        resolver._check_tempdir = True
+        return resolver
+
+    @classmethod
+    def for_user(cls, user, environ=None):
+        """Create a resolver for a user in the password database.
+
+        The user's environment is not known, so default values are used for
+        environment variables, unless given in `environ`.
+
+        :param user: A user ID or user name.
+        :raises KeyError: If the user does not exist.
+        """
+        import pwd
+        if isinstance(user, int):
+            entry = pwd.getpwuid(user)
+        else:
+            entry = pwd.getpwnam(user)
+        return cls._for_passwd_entry(entry, environ)
+
+    @classmethod
+    def _for_passwd_entry(cls, entry, environ=None):
+        resolver = cls(environ or {}, entry.pw_dir, entry.pw_uid)
+        resolver._username = entry.pw_name
+        return resolver
+
+    def _get_filesystem(self):
+        if self.filesystem is None:
+            return get_filesystem()
+        return self.filesystem
+
+    @property
+    def tempdir(self):
+        if self._tempdir is None:
+            self._tempdir = self._find_tempdir()
+        return self._tempdir
+
+    def _find_tempdir(self):
+        candidates = [
+            self.environ[name] for name in ('TMPDIR', 'TEMP', 'TMP',)
+            if self.environ.get(name)
+        ]
+        if not self._check_tempdir:
+            return candidates[0] if candidates else '/tmp'
+        return _find_usable_tempdir(
+            candidates + list(_TEMPDIR_FALLBACKS), self._get_filesystem(),
+        )
+
+    def _get_tempdir_str(self):
+        if self._tempdir_str is None:
+            self._tempdir_str = _to_path_str(self.tempdir)
+        return self._tempdir_str
+
+    @property
+    def username(self):
+        if self._username is None:
+            import pwd
+            self._username = pwd.getpwuid(self.uid).pw_name
+        return self._username
+
+    def writable_path(self, location, config=None, as_str=False):
+        """Get the directory where files of type should be written to.
+
+        .. seealso::
+            :func:`.get_writable_path`.
+        """
+        path_str = self._get_writable_path(location, config, {})
+        if as_str:
+            return path_str
+        import pathlib
+        return pathlib.Path(path_str)
+
+    def standard_paths(self, location, config=None, as_str=False):
+        """Get all the directories where files of type belong.
+
+        .. seealso::
+            :func:`.get_standard_paths`.
+        """
+        memo = {}
         try:
-            path = _get_path('XDG_RUNTIME_DIR', RAISE)
+            path_str = self._get_writable_path(location, config, memo)
+        except LocationError:
+            path_str = None
+        path_strs = self._get_standard_paths(location, config, path_str, memo)
+        if as_str:
+            return path_strs
+        import pathlib
+        return [pathlib.Path(ps) for ps in path_strs]
+
+    def resolve_many(self, locations, config=None, as_str=False):
+        """Resolve multiple locations in one pass.
+
+        .. seealso::
+            :func:`.resolve_many`.
+        """
+        memo = {}
+        return _resolve_many(
+            locations, config,
+            lambda location, config: self._get_memoized(
+                location, config, memo,
+            ),
+            lambda location, config, path_str: self._get_standard_paths(
+                location, config, path_str, memo,
+            ),
+            as_str=as_str,
+        )
+
+    def _get_path(self, environ_name, default):
+        # http://standards.freedesktop.org/basedir-spec/latest/
+        path_str = self.environ.get(environ_name) or default
+        if path_str == '~' or path_str.startswith('~/'):
+            path_str = self._expand_home(path_str[1:])
+        return _to_path_str(path_str)
+
+    def _expand_home(self, rest):
+        """Prepend the home directory to `rest`, like
+        :func:`os.path.expanduser`, so a home of `/` does not produce `//`.
+        """
+        return (self.home.rstrip('/') + rest) or '/'
+
+    def _get_dirs(self, environ_name, names=()):
+        """Get directories listed in an environment variable, with `names`
+        joined to each.
+        """
+        default = _DEFAULT_DIRS[environ_name]
+        value = self.environ.get(environ_name)
+        if not names:
+            return _parse_dir_list(value, default)
+        return _get_derived_dirs(value, default, names)
+
+    def _get_memoized(self, location, config, memo):
+        try:
+            return memo[location]
         except KeyError:
-            path = get_writable_path(Location.temp) / ('runtime-' + username)
-            if not path.exists():
-                path.mkdir()
-            logger.warning(
-                "XDG_RUNTIME_DIR not set, defaulting to '{}'".format(
-                    path.as_posix(),
+            pass
+        path = memo[location] = self._get_writable_path(location, config, memo)
+        return path
+
+    def _get_memoized_user_dirs(self, config, memo):
+        try:
+            return memo['user-dirs']
+        except KeyError:
+            pass
+        path = self._get_memoized(Location.config, config, memo)
+        values = memo['user-dirs'] = _read_user_dirs(
+            _join(path, 'user-dirs.dirs'), self._get_filesystem(),
+        )
+        return values
+
+    def _get_writable_path(self, location, config, memo):
+        """Resolve the writable path of a location, as a normalized string.
+
+        `memo` is a dict to store intermediate results in, so they can be
+        shared when resolving multiple locations in one pass.
+        """
+        # TODO: Make sure these fit Qt's implementation.
+        if location == Location.home:
+            return self._home_str
+        if location == Location.temp:
+            return self._get_tempdir_str()
+
+        if location == Location.generic_cache:
+            return self._get_path('XDG_CACHE_HOME', '~/.cache')
+        if location == Location.cache:
+            path = self._get_memoized(Location.generic_cache, config, memo)
+            return _append_org_and_app(path, config)
+        if location == Location.generic_data:
+            return self._get_path('XDG_DATA_HOME', '~/.local/share')
+        if location in (Location.app_data, Location.app_local_data,):
+            path = self._get_memoized(Location.generic_data, config, memo)
+            return _append_org_and_app(path, config)
+        if location in (Location.config, Location.generic_config,):
+            return self._get_path('XDG_CONFIG_HOME', '~/.config')
+        if location == Location.log:
+            # Free Desktop does not provide any suggestions on where log files
+            # should be placed, and there is no consensus in the community.
+            # Debian has a proposal for this, but nobody really does it. I'm
+            # personally in the "log files are not essential" camp, and agrees
+            # that it belongs better with cache than data.
+            # http://stackoverflow.com/a/27965014/1376863
+            path = self._get_memoized(Location.cache, config, memo)
+            return _join(path, 'log')
+        if location == Location.runtime:
+            if self.environ.get('XDG_RUNTIME_DIR'):
+                return self._get_path('XDG_RUNTIME_DIR', None)
+            try:
+                username = self.username
+            except KeyError:
+                raise LocationError(
+                    'Could not resolve {}: unknown user ID {}'.format(
+                        location.name, self.uid,
+                    ),
+                )
+            path = self._get_memoized(Location.temp, config, memo)
+            return _join(path, 'runtime-' + username)
+
+        if location == Location.applications:
+            path = self._get_memoized(Location.generic_data, config, memo)
+            return _join(path, 'applications')
+
+        # http://www.freedesktop.org/wiki/Software/xdg-user-dirs
+        try:
+            key = {
+                Location.desktop: 'DESKTOP',
+                Location.documents: 'DOCUMENTS',
+                Location.pictures: 'PICTURES',
+                Location.music: 'MUSIC',
+                Location.movies: 'VIDEOS',
+                Location.download: 'DOWNLOAD',
+            }[location]
+        except KeyError:
+            pass
+        else:
+            value = self._get_memoized_user_dirs(config, memo).get(key)
+            # The spec only allows paths relative to $HOME, or absolute paths.
+            if value and value.startswith('$HOME'):
+                value = self._expand_home(value[len('$HOME'):])
+            if value:
+                return _to_path_str(value)
+            _record('fallback', location.name)
+
+        try:
+            name = {
+                Location.desktop: 'Desktop',
+                Location.documents: 'Documents',
+                Location.pictures: 'Pictures',
+                Location.music: 'Music',
+                Location.movies: 'Videos',
+                Location.download: 'Downloads',
+                Location.fonts: '.fonts',
+            }[location]
+        except KeyError:
+            pass
+        else:
+            path = self._get_memoized(Location.home, config, memo)
+            return _join(path, name)
+
+        raise LocationError('Could not resolve {}'.format(location.name))
+
+    def _get_standard_paths(self, location, config, path, memo):
+        paths = [] if path is None else [path]
+        if location in (Location.config, Location.generic_config,):
+            paths.extend(self._get_dirs('XDG_CONFIG_DIRS'))
+        elif location == Location.generic_data:
+            paths.extend(self._get_dirs('XDG_DATA_DIRS'))
+        elif location == Location.applications:
+            paths.extend(self._get_dirs('XDG_DATA_DIRS', ('applications',)))
+        elif location in (Location.app_data, Location.app_local_data):
+            if config is None:
+                config = get_config()
+            names = tuple(name for name in (
+                config.organization_name, config.application_name,
+            ) if name)
+            paths.extend(self._get_dirs('XDG_DATA_DIRS', names))
+        return paths
+
+
+def _resolve_for_resolver(resolver, locations, config, as_str):
+    return resolver.resolve_many(locations, config, as_str=as_str)
+
+
+def for_users(users=None, locations=None, config=None, as_str=False,
+              workers=None):
+    """Resolve locations for multiple users in the password database.
+
+    The password database is read once. Each user is resolved with a
+    :class:`.Resolver` (see :meth:`.Resolver.for_user`), reading the user's
+    `user-dirs.dirs`. Runtime directories are not created or checked.
+
+    :param users: An iterable of user IDs or user names. If omitted, all
+        users in the password database are resolved.
+    :param locations: Locations to resolve. Defaults to all locations.
+    :param workers: If given, users are resolved in parallel, with this many
+        threads.
+    :returns: A dict mapping user names to results of
+        :meth:`.Resolver.resolve_many`. Unknown users are skipped.
+    """
+    import pwd
+    entries = pwd.getpwall()
+    if users is not None:
+        by_uid = {}
+        by_name = {}
+        for entry in entries:
+            by_uid.setdefault(entry.pw_uid, entry)
+            by_name.setdefault(entry.pw_name, entry)
+        entries = []
+        for user in users:
+            lookup = by_uid if isinstance(user, int) else by_name
+            try:
+                entries.append(lookup[user])
+            except KeyError:
+                pass
+    if locations is None:
+        locations = list(Location)
+    else:
+        locations = [
+            loc if isinstance(loc, Location) else Location[str(loc)]
+            for loc in locations
+        ]
+    if config is None:
+        # Worker threads do not see a config set with use_config().
+        config = get_config()
+    resolvers = collections.OrderedDict(
+        (entry.pw_name, Resolver._for_passwd_entry(entry))
+        for entry in entries
+    )
+    if workers and workers > 1 and len(resolvers) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                _resolve_for_resolver, resolvers.values(),
+                itertools.repeat(locations), itertools.repeat(config),
+                itertools.repeat(as_str),
+            ))
+    else:
+        results = [
+            _resolve_for_resolver(resolver, locations, config, as_str)
+            for resolver in resolvers.values()
+        ]
+    return collections.OrderedDict(zip(resolvers, results))
+
+
+# Directories tried after environment variables, in the order tempfile tries
+# them.
+_TEMPDIR_FALLBACKS = ('/tmp', '/var/tmp', '/usr/tmp',)
+
+_strict_tempdir = False
+
+
+def _find_usable_tempdir(candidates, filesystem):
+    """Find the first directory in `candidates` the process can create files
+    in, with one access check each.
+
+    Unlike :func:`tempfile.gettempdir`, this does not create files to probe
+    candidates. If no candidate passes the check, the first candidate is
+    returned, unless strict mode is enabled with :func:`.set_strict_tempdir`.
+    """
+    tempfile = sys.modules.get('tempfile')
+    if tempfile is not None and tempfile.tempdir is not None:
+        return tempfile.tempdir     # Set by the user, or already probed.
+    for path_str in candidates:
+        _record('fs', 'access')
+        if filesystem.access(path_str, os.W_OK | os.X_OK):
+            return path_str
+    _record('fallback', 'temp')
+    if not _strict_tempdir:
+        return candidates[0]
+    import tempfile
+    try:
+        return tempfile.gettempdir()
+    except FileNotFoundError as e:
+        raise LocationError(str(e))
+
+
+def set_strict_tempdir(strict):
+    """Set whether to probe for a temporary directory when checks fail.
+
+    The temporary directory of the process is found by checking whether
+    `TMPDIR`, `TEMP`, `TMP`, `/tmp`, `/var/tmp` and `/usr/tmp` are writable,
+    in that order, without creating files in them. If none of them is, the
+    first one is used by default. In strict mode, :func:`tempfile.gettempdir`
+    is called instead, which tries to create a file in each candidate, and
+    :class:`.LocationError` is raised if none is usable.
+    """
+    global _strict_tempdir
+    _strict_tempdir = bool(strict)
+    _cache.discard([Location.temp, Location.runtime])
+
+
+_process_resolver = (None, None)
+
+
+def _get_process_resolver():
+    """Get a resolver for the current process's state.
+
+    The resolver is reused until the environment or effective user changes.
+    """
+    global _process_resolver
+    fingerprint = (_get_environ_fingerprint(), os.geteuid(), _strict_tempdir)
+    cached_fingerprint, resolver = _process_resolver
+    if resolver is None or cached_fingerprint != fingerprint:
+        resolver = Resolver.for_process()
+        _process_resolver = (fingerprint, resolver)
+    return resolver
+
+
+def _get_username(uid):
+    import pwd
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+# Runtime directories validated in this process. Maps (file system, path,
+# uid) to the (st_ino, st_mtime_ns) of the directory when it was validated.
+_validated_runtime_dirs = {}
+
+
+def _prepare_runtime_dir(path, resolver):
+    """Create the runtime directory if needed, and make sure it is usable.
+
+    An already-validated directory costs one stat. Otherwise the directory
+    is opened, and checked and fixed through the handle, so it cannot be
+    swapped between the checks. Symbolic links are rejected, so another user
+    cannot point the path at a directory owned by this user.
+    """
+    filesystem = resolver._get_filesystem()
+    path_str = str(path)
+    uid = resolver.uid
+    key = (filesystem, path_str, uid)
+    _record('fs', 'stat')
+    try:
+        st = filesystem.lstat(path_str)
+    except OSError:
+        st = None
+    else:
+        if stat.S_ISLNK(st.st_mode):
+            raise LocationError(
+                "Runtime directory '{path}' is a symbolic link".format(
+                    path=path_str,
                 ),
             )
-        if path.owner() != username:
+        valid = (st.st_uid == uid and (st.st_mode & 0o777) == stat.S_IRWXU)
+        signature = (st.st_ino, st.st_mtime_ns)
+        if valid and _validated_runtime_dirs.get(key) == signature:
+            return
+
+    if not resolver.environ.get('XDG_RUNTIME_DIR'):
+        if st is None:
+            _record('fs', 'mkdir')
+            try:
+                filesystem.mkdir(path_str, stat.S_IRWXU)
+            except FileExistsError:
+                pass
+            except OSError as e:
+                raise LocationError(
+                    "Could not create runtime directory '{path}': "
+                    "{error}".format(path=path_str, error=str(e)),
+                )
+        _record('fallback', 'runtime')
+        _get_logger().warning(
+            "XDG_RUNTIME_DIR not set, defaulting to '{}'".format(
+                path_str,
+            ),
+        )
+
+    _record('fs', 'open')
+    try:
+        handle = filesystem.open_dir(path_str)
+    except OSError as e:
+        raise LocationError(
+            "Could not open runtime directory '{path}': {error}".format(
+                path=path_str, error=str(e),
+            ),
+        )
+    try:
+        _record('fs', 'fstat')
+        st = filesystem.fstat(handle)
+        if st.st_uid != uid:
             raise LocationError(
                 "Wrong ownership on runtime directory '{path}', "
                 "{real} instead of {expected}".format(
-                    path=path.as_posix(), real=path.owner(), expected=username,
+                    path=path_str, real=_get_username(st.st_uid),
+                    expected=_get_username(uid),
                 ),
             )
-        if (path.stat().st_mode & 0o777) != stat.S_IRWXU:
+        if (st.st_mode & 0o777) != stat.S_IRWXU:
+            _record('fs', 'chmod')
             try:
-                path.chmod(stat.S_IRWXU)
+                filesystem.fchmod(handle, stat.S_IRWXU)
             except Exception as e:
                 raise LocationError(
                     "Could not set permisson on runtime directory '{path}': "
-                    "{error}".format(path=path.as_posix(), error=str(e)),
+                    "{error}".format(path=path_str, error=str(e)),
                 )
-        return path
+    finally:
+        filesystem.close(handle)
+    _validated_runtime_dirs[key] = (st.st_ino, st.st_mtime_ns)
 
-    if location == Location.applications:
-        return get_writable_path(Location.generic_data) / 'applications'
 
-    # http://www.freedesktop.org/wiki/Software/xdg-user-dirs
-    try:
-        key = {
-            Location.desktop: 'DESKTOP',
-            Location.documents: 'DOCUMENTS',
-            Location.pictures: 'PICTURES',
-            Location.music: 'MUSIC',
-            Location.movies: 'VIDEOS',
-            Location.download: 'DOWNLOAD',
-        }[location]
-    except KeyError:
-        pass
-    else:
-        value = None
-        user_dirs = get_writable_path(Location.config) / 'user-dirs.dirs'
-        with user_dirs.open() as f:
-            xdg_dir_pat = re.compile(r'^XDG_(.*)_DIR=(.*)\s*$')
-            for line in f:
-                match = xdg_dir_pat.match(line)
-                if match and match.group(1) == key:
-                    value = match.group(2).strip('"')
-                    if value:
-                        return pathlib.Path(os.path.expandvars(value))
+# The active inotify watcher, if watching. See start_watching().
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def _invalidate_user_dirs():
+    _cache.discard(_USER_DIR_LOCATIONS)
+
+
+def _invalidate_runtime():
+    _cache.discard(_RUNTIME_LOCATIONS)
+
+
+def _watch(path, callback):
+    """Watch `path` if watching is active, calling `callback` on changes.
+
+    If the path cannot be watched, `callback` is called immediately, so the
+    result being resolved is not cached.
+    """
+    watcher = _watcher
+    if watcher is None:
+        return
+    filesystem = get_filesystem()
+    if type(filesystem) is not RealFileSystem:
+        callback()
+    elif not watcher.watch(str(path), callback):
+        callback()
 
-    try:
-        return get_writable_path(Location.home) / {
-            Location.desktop: 'Desktop',
-            Location.documents: 'Documents',
-            Location.pictures: 'Pictures',
-            Location.music: 'Music',
-            Location.movies: 'Videos',
-            Location.download: 'Downloads',
-            Location.fonts: '.fonts',
-        }[location]
-    except KeyError:
-        pass
 
-    raise LocationError('Could not resolve {}'.format(location.name))
+def start_watching():
+    """Watch files that affect resolution for changes, and cache results that
+    would otherwise be re-validated on each lookup. Linux only.
 
+    With the watcher active, user directories (e.g. :attr:`.Location.desktop`)
+    and the runtime directory are cached like other locations. Cached results
+    are dropped when `user-dirs.dirs` or the runtime directory changes (e.g.
+    when `xdg-user-dirs-update` runs), so looking up a cached location does
+    not touch the file system at all.
 
-def get_standard_paths(location, config=None):
+    Changes are noticed by a background thread, so a lookup made immediately
+    after a change may still return the previous result.
+
+    :returns: Whether watching is active. This is `False` if inotify is not
+        available.
+
+    .. seealso::
+        :func:`.stop_watching`.
+    """
+    global _watcher, UNCACHED_LOCATIONS
+    with _watcher_lock:
+        if _watcher is not None:
+            return True
+        from .inotify import Watcher
+        try:
+            _watcher = Watcher()
+        except OSError as e:
+            _get_logger().debug('Could not start watching: {}'.format(e))
+            return False
+        UNCACHED_LOCATIONS = frozenset()
+    return True
+
+
+def stop_watching():
+    """Stop watching for changes, and go back to re-validating user
+    directories and the runtime directory on each lookup.
+
+    .. seealso::
+        :func:`.start_watching`.
+    """
+    global _watcher, UNCACHED_LOCATIONS
+    with _watcher_lock:
+        watcher = _watcher
+        if watcher is None:
+            return
+        UNCACHED_LOCATIONS = _USER_DIR_LOCATIONS | _RUNTIME_LOCATIONS
+        _watcher = None
+    _cache.discard(UNCACHED_LOCATIONS)
+    watcher.close()
+
+
+def _get_writable_path(resolver, location, config, memo):
+    if location in _USER_DIR_LOCATIONS:
+        # Watch before reading, so changes made while reading are noticed.
+        path = resolver._get_memoized(Location.config, config, memo)
+        _watch(_join(path, 'user-dirs.dirs'), _invalidate_user_dirs)
+    path = resolver._get_memoized(location, config, memo)
+    if location == Location.runtime:
+        _prepare_runtime_dir(path, resolver)
+        if _watcher is not None:
+            # The directory may not exist before it is prepared. Re-validate
+            # after watching it, to catch changes made in between.
+            _watch(path, _invalidate_runtime)
+            _prepare_runtime_dir(path, resolver)
+    return path
+
+
+def get_writable_path(location, config=None, as_str=False):
+    path = _get_writable_path(_get_process_resolver(), location, config, {})
+    if as_str:
+        return path
+    import pathlib
+    return pathlib.Path(path)
+
+
+def get_standard_paths(location, config=None, as_str=False):
+    resolver = _get_process_resolver()
+    memo = {}
     try:
-        paths = [get_writable_path(location, config)]
+        path = _get_writable_path(resolver, location, config, memo)
     except LocationError:
-        paths = []
-    if location in (Location.config, Location.generic_config,):
-        return paths + [
-            pathlib.Path(ps)
-            for ps in _get_path_str('XDG_CONFIG_DIRS', '/etc/xdg').split(':')
-        ]
-    if location == Location.generic_data:
-        return paths + _get_xdg_data_dirs()
-    if location == Location.applications:
-        return paths + [path / 'applications' for path in _get_xdg_data_dirs()]
-    if location in (Location.app_data, Location.app_local_data):
-        return paths + [
-            _append_org_and_app(path, config) for path in _get_xdg_data_dirs()
-        ]
-    return paths
+        path = None
+        if location == Location.runtime:
+            return []
+    paths = resolver._get_standard_paths(location, config, path, memo)
+    if as_str:
+        return paths
+    import pathlib
+    return [pathlib.Path(p) for p in paths]
+
+
+def resolve_many(locations, config=None, as_str=False):
+    resolver = _get_process_resolver()
+    memo = {}
+    return _resolve_many(
+        locations, config,
+        lambda location, config: _get_writable_path(
+            resolver, location, config, memo,
+        ),
+        lambda location, config, path: resolver._get_standard_paths(
+            location, config, path, memo,
+        ),
+        as_str=as_str,
+    )
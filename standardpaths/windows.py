@@ -9,9 +9,11 @@ import os.path
 import pathlib
 import tempfile
 
-from .base import Config, Location, LocationError, _append_org_and_app
+from .base import (
+    Config, Location, LocationError, _append_org_and_app, _resolve_many,
+)
 
-__all__ = ['get_writable_path', 'get_standard_paths']
+__all__ = ['get_writable_path', 'get_standard_paths', 'resolve_many']
 
 
 c_bytes_8 = ctypes.c_byte * 8
@@ -136,11 +138,8 @@ def get_writable_path(location, config=None):
     )
 
 
-def get_standard_paths(location, config=None):
-    try:
-        paths = [get_writable_path(location, config)]
-    except LocationError:
-        paths = []
+def _get_standard_paths(location, config, path):
+    paths = [] if path is None else [path]
     if location in (Location.generic_data, Location.generic_config,):
         paths.append(_get_data_config_path(location, Config('', '')))
     elif location in (
@@ -153,3 +152,17 @@ def get_standard_paths(location, config=None):
     # TODO: Support this through a config value?
 
     return paths
+
+
+def get_standard_paths(location, config=None):
+    try:
+        path = get_writable_path(location, config)
+    except LocationError:
+        path = None
+    return _get_standard_paths(location, config, path)
+
+
+def resolve_many(locations, config=None):
+    return _resolve_many(
+        locations, config, get_writable_path, _get_standard_paths,
+    )
@@ -1 +1,31 @@
 # -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from standardpaths import clear_cache, disable_stats
+
+
+class TemporaryHomeMixin(object):
+    """Run each test with an empty temporary directory as `HOME`, and without
+    the XDG base directory variables.
+
+    The environment is restored, and the resolution cache cleared, after each
+    test.
+    """
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.environ = os.environ.copy()
+        self.addCleanup(self._restore)
+        os.environ['HOME'] = self.home
+        for name in ('XDG_CACHE_HOME', 'XDG_DATA_HOME', 'XDG_CONFIG_HOME',):
+            os.environ.pop(name, None)
+        clear_cache()
+
+    def _restore(self):
+        disable_stats()
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.home)
+        clear_cache()
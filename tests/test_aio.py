@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_aio
+----------------------------------
+
+Tests for `standardpaths.aio`.
+"""
+
+import asyncio
+import pathlib
+import platform
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import (
+    Config, Location, get_standard_paths, get_writable_path,
+)
+from standardpaths import aio
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class AsyncTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def test_same_as_sync(self):
+        config = Config('Yksom', 'uranusjr')
+
+        async def resolve():
+            return (
+                await aio.get_writable_path('cache', config),
+                await aio.get_standard_paths(Location.app_data, config),
+                await aio.get_writable_path(Location.documents),
+            )
+
+        eq_(asyncio.run(resolve()), (
+            get_writable_path(Location.cache, config),
+            get_standard_paths(Location.app_data, config),
+            get_writable_path(Location.documents),
+        ))
+
+    def test_coalesced(self):
+        calls = []
+
+        def resolve(location, config):
+            calls.append(location)
+            return pathlib.Path('/coalesced')
+
+        async def resolve_concurrently():
+            return await asyncio.gather(*[
+                aio._run_coalesced('key', resolve, Location.home, None)
+                for _ in range(10)
+            ])
+
+        eq_(asyncio.run(resolve_concurrently()),
+            [pathlib.Path('/coalesced')] * 10)
+        eq_(calls, [Location.home])
+        eq_(aio._in_flight, {})
+
+    def test_resolve_all(self):
+        results = asyncio.run(aio.resolve_all())
+        eq_(results[Location.home].writable_path, pathlib.Path(self.home))
+
+    def test_ensure_dir(self):
+        config = Config('Yksom', 'uranusjr')
+        path = asyncio.run(aio.ensure_dir(Location.log, config))
+        eq_(path, pathlib.Path(self.home, '.cache/uranusjr/Yksom/log'))
+        self.assertTrue(path.is_dir())
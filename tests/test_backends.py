@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_backends
+----------------------------------
+
+Tests for backend registration and dispatch.
+"""
+
+import pathlib
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import (
+    Location, get_backend, get_standard_paths, get_writable_path,
+    register_backend, resolve_many, set_backend,
+)
+from standardpaths.base import _resolve_many
+
+
+class SandboxBackend(object):
+    """Everything lives under /sandbox.
+    """
+    @staticmethod
+    def get_writable_path(location, config=None):
+        return pathlib.Path('/sandbox', location.name)
+
+    @staticmethod
+    def get_standard_paths(location, config=None):
+        return [SandboxBackend.get_writable_path(location, config)]
+
+    @staticmethod
+    def resolve_many(locations, config=None):
+        return _resolve_many(
+            locations, config, SandboxBackend.get_writable_path,
+            lambda location, config, path: [path],
+        )
+
+
+class BackendRegistryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.default = get_backend()
+
+    def tearDown(self):
+        set_backend(None)
+
+    def test_set_backend_by_name(self):
+        register_backend('sandbox', SandboxBackend)
+        set_backend('sandbox')
+        eq_(get_backend(), SandboxBackend)
+        eq_(get_writable_path('cache'), pathlib.Path('/sandbox/cache'))
+        eq_(get_standard_paths(Location.log), [pathlib.Path('/sandbox/log')])
+        eq_(resolve_many(['home'])[Location.home].writable_path,
+            pathlib.Path('/sandbox/home'))
+
+    def test_set_backend_clears_cache(self):
+        path = get_writable_path(Location.generic_data)
+        set_backend(SandboxBackend)
+        self.assertNotEqual(get_writable_path(Location.generic_data), path)
+        set_backend(None)
+        eq_(get_writable_path(Location.generic_data), path)
+        eq_(get_backend(), self.default)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(LookupError):
+            set_backend('nonexistent')
+        eq_(get_backend(), self.default)
+
+    def test_invalid_backend(self):
+        with self.assertRaises(TypeError):
+            set_backend(object())
+        eq_(get_backend(), self.default)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_cache
+----------------------------------
+
+Tests for the resolution cache.
+"""
+
+import os
+import pathlib
+import platform
+import tempfile
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import (
+    Config, Location, base, clear_cache, get_cache_info,
+    get_standard_paths, get_writable_path,
+)
+from standardpaths.filesystem import CountingFileSystem, set_filesystem
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class ResolutionCacheTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        config = Config('Yksom', 'uranusjr')
+        path = get_writable_path(Location.cache, config)
+        eq_(get_cache_info().misses, 1)
+        eq_(get_writable_path(Location.cache, config), path)
+        eq_(get_cache_info().hits, 1)
+        eq_(path, pathlib.Path(self.home, '.cache', 'uranusjr', 'Yksom'))
+
+    def test_keyed_on_config(self):
+        path = get_writable_path(Location.cache, Config('Yksom', 'uranusjr'))
+        other = get_writable_path(Location.cache, Config('Pepsi', 'uranusjr'))
+        self.assertNotEqual(path, other)
+        eq_(get_cache_info().misses, 2)
+
+    def test_environment_change_invalidates(self):
+        get_writable_path(Location.generic_cache)
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.home, 'elsewhere')
+        eq_(get_writable_path(Location.generic_cache),
+            pathlib.Path(self.home, 'elsewhere'))
+        eq_(get_cache_info().misses, 2)
+
+    def test_standard_paths_returns_copy(self):
+        paths = get_standard_paths(Location.generic_data)
+        paths.append(pathlib.Path('/nowhere'))
+        paths = get_standard_paths(Location.generic_data)
+        self.assertNotIn(pathlib.Path('/nowhere'), paths)
+
+    def test_clear_cache(self):
+        get_writable_path(Location.generic_data)
+        clear_cache()
+        eq_(tuple(get_cache_info()), (0, 0, 0))
+
+    def test_bounded(self):
+        maxsize = base._cache.maxsize
+        base._cache.maxsize = 4
+        try:
+            for name in ('a', 'b', 'c'):
+                get_writable_path(Location.cache, Config(name))
+            get_writable_path(Location.cache, Config('a'))
+            get_writable_path(Location.cache, Config('d'))
+            get_writable_path(Location.cache, Config('e'))
+            eq_(get_cache_info().size, 4)
+            # 'b' was the least recently used entry.
+            get_writable_path(Location.cache, Config('a'))
+            get_writable_path(Location.cache, Config('b'))
+            eq_(get_cache_info()[:2], (2, 6))
+        finally:
+            base._cache.maxsize = maxsize
+
+    def test_hit_skips_file_system(self):
+        os.environ['TMPDIR'] = self.home
+        tempfile.tempdir = None     # Make the temporary directory checked.
+        fs = CountingFileSystem()
+        set_filesystem(fs)
+        self.addCleanup(set_filesystem, None)
+        get_writable_path(Location.temp)
+        eq_(fs.counts['access'], 1)
+        with fs.budget(0):
+            eq_(get_writable_path(Location.temp), pathlib.Path(self.home))
+
+    def test_environ_fingerprint_fallback(self):
+        # Any mapping works as os.environ, read with the public interface.
+        environ = os.environ
+        os.environ = dict(environ)
+        try:
+            fingerprint = base._get_environ_fingerprint()
+            eq_(fingerprint, base._get_environ_values())
+            os.environ['XDG_CACHE_HOME'] = '/elsewhere'
+            self.assertNotEqual(base._get_environ_fingerprint(), fingerprint)
+        finally:
+            os.environ = environ
+        self.assertNotEqual(base._get_environ_fingerprint(), fingerprint)
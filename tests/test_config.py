@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_config
+----------------------------------
+
+Tests for configs and context-local configuration.
+"""
+
+import asyncio
+import pathlib
+import pickle
+import platform
+import threading
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import (
+    Config, Location, configure, get_config, get_writable_path,
+    resolve_configs, resolve_configs_columns, use_config,
+)
+from standardpaths import aio
+
+from . import TemporaryHomeMixin
+
+
+class ConfigTests(unittest.TestCase):
+
+    def test_immutable(self):
+        config = Config('Yksom', 'uranusjr')
+        with self.assertRaises(AttributeError):
+            config.application_name = 'Pepsi'
+        with self.assertRaises(AttributeError):
+            config.extra = 1
+
+    def test_equality(self):
+        eq_(Config('Yksom', 'uranusjr'), Config('Yksom', 'uranusjr'))
+        eq_(hash(Config('Yksom', 'uranusjr')),
+            hash(Config('Yksom', 'uranusjr')))
+        self.assertNotEqual(Config('Yksom', 'uranusjr'), Config('Yksom'))
+        eq_(len({Config('a'), Config('a'), Config('b')}), 2)
+
+    def test_pickle(self):
+        config = Config('Yksom', 'uranusjr')
+        eq_(pickle.loads(pickle.dumps(config)), config)
+
+
+class UseConfigTests(unittest.TestCase):
+
+    def tearDown(self):
+        configure()
+
+    def test_overrides_configure(self):
+        configure('Default')
+        with use_config(Config('Yksom', 'uranusjr')) as config:
+            eq_(get_config(), config)
+        eq_(get_config(), Config('Default'))
+
+    def test_thread_local(self):
+        seen = []
+        with use_config(Config('Yksom')):
+            thread = threading.Thread(
+                target=lambda: seen.append(get_config()),
+            )
+            thread.start()
+            thread.join()
+        eq_(seen, [Config()])
+
+    def test_task_local(self):
+        async def worker(name):
+            with use_config(Config(name)):
+                await asyncio.sleep(0)
+                return get_config().application_name
+
+        async def main():
+            return await asyncio.gather(worker('a'), worker('b'))
+
+        eq_(asyncio.run(main()), ['a', 'b'])
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class UseConfigResolutionTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def test_cache_keyed_on_config(self):
+        with use_config(Config('a')):
+            eq_(get_writable_path(Location.cache),
+                pathlib.Path(self.home, '.cache', 'a'))
+        with use_config(Config('b')):
+            eq_(get_writable_path(Location.cache),
+                pathlib.Path(self.home, '.cache', 'b'))
+
+    def test_aio(self):
+        async def main():
+            with use_config(Config('a')):
+                return await aio.get_writable_path(Location.cache)
+
+        eq_(asyncio.run(main()), pathlib.Path(self.home, '.cache', 'a'))
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class ResolveConfigsTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(ResolveConfigsTests, self).setUp()
+        self.locations = [
+            Location.app_data, Location.cache, Location.config, Location.log,
+        ]
+
+    def test_same_as_individual_calls(self):
+        configs = [
+            Config('Yksom', 'uranusjr'), Config('Yksom'),
+            Config(organization_name='uranusjr'), Config(),
+            Config('a/b', 'c'), Config('..', '.'),
+        ]
+        results = list(resolve_configs(self.locations, configs))
+        eq_([config for config, _ in results], configs)
+        for config, paths in results:
+            eq_(list(paths), self.locations)
+            for location, path in paths.items():
+                eq_(path, get_writable_path(location, config))
+
+    def test_columns(self):
+        configs = [Config('app{}'.format(i), 'org') for i in range(3)]
+        columns = resolve_configs_columns(['cache', 'log'], configs)
+        eq_(list(columns), [Location.cache, Location.log])
+        eq_(columns[Location.log], [
+            pathlib.Path(self.home, '.cache', 'org', 'app{}'.format(i), 'log')
+            for i in range(3)
+        ])
+
+    def test_lazy(self):
+        def configs():
+            yield Config('a')
+            raise AssertionError('Consumed too far')
+
+        results = resolve_configs(['cache'], configs())
+        config, paths = next(results)
+        eq_(paths, {Location.cache: pathlib.Path(self.home, '.cache', 'a')})
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_desktop
+----------------------------------
+
+Tests for the desktop entry catalogue.
+"""
+
+import json
+import os
+import platform
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import clear_cache
+from standardpaths.desktop import _index, get_desktop_entries
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class DesktopEntriesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.environ = os.environ.copy()
+        self.dirs = [
+            os.path.join(self.root, name, 'applications')
+            for name in ('home', 'a', 'b',)
+        ]
+        for path in self.dirs:
+            os.makedirs(path)
+        os.environ['XDG_DATA_HOME'] = os.path.dirname(self.dirs[0])
+        os.environ['XDG_DATA_DIRS'] = ':'.join(
+            os.path.dirname(path) for path in self.dirs[1:]
+        )
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.root, 'cache')
+        self._write(self.dirs[1], 'editor.desktop', Name='Editor A')
+        self._write(self.dirs[2], 'editor.desktop', Name='Editor B')
+        self._write(self.dirs[2], 'viewer.desktop', Name='Viewer')
+        self._write(self.dirs[2], 'kde4/konsole.desktop', Name='Konsole')
+        clear_cache()
+        _index.__init__()
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.root)
+        clear_cache()
+        _index.__init__()
+
+    def _write(self, directory, name, **values):
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write('# Comment\n[Desktop Entry]\nType=Application\n')
+            for key, value in values.items():
+                f.write('{}={}\n'.format(key, value))
+            f.write('[Desktop Action new]\nName=Ignored\n')
+        return path
+
+    def _get_names(self, **kwargs):
+        return {
+            desktop_id: entry.values['Name']
+            for desktop_id, entry in get_desktop_entries(**kwargs).items()
+        }
+
+    def test_entries(self):
+        entries = get_desktop_entries()
+        eq_(list(entries), [
+            'editor.desktop', 'viewer.desktop', 'kde4-konsole.desktop',
+        ])
+        entry = entries['kde4-konsole.desktop']
+        eq_(entry.id, 'kde4-konsole.desktop')
+        eq_(entry.path, os.path.join(self.dirs[2], 'kde4', 'konsole.desktop'))
+        eq_(entry.values, {'Type': 'Application', 'Name': 'Konsole'})
+
+    def test_shadowed(self):
+        eq_(self._get_names()['editor.desktop'], 'Editor A')
+
+    def test_hidden(self):
+        self._write(self.dirs[0], 'editor.desktop', Hidden='true')
+        self._write(self.dirs[0], 'other.desktop', Name='Other')
+        names = self._get_names()
+        self.assertNotIn('editor.desktop', names)
+        eq_(names['other.desktop'], 'Other')
+
+    def test_workers(self):
+        eq_(self._get_names(workers=4), self._get_names(index=False))
+
+    def test_paths(self):
+        eq_(self._get_names(paths=[self.dirs[2], self.dirs[1]]), {
+            'editor.desktop': 'Editor B', 'kde4-konsole.desktop': 'Konsole',
+            'viewer.desktop': 'Viewer',
+        })
+
+    def test_symlinked_directory(self):
+        os.symlink(self.dirs[2], os.path.join(self.dirs[2], 'loop'))
+        self.assertNotIn('loop-viewer.desktop', self._get_names())
+
+    def test_index_reused(self):
+        self._get_names()
+        directory = os.path.join(self.root, 'cache', 'standardpaths')
+        eq_(len(os.listdir(directory)), 1)
+
+        # Modify in place, keeping the directory's mtime. A new process does
+        # not notice this, since it reads the index.
+        path = os.path.join(self.dirs[2], 'viewer.desktop')
+        st = os.stat(self.dirs[2])
+        self._write(self.dirs[2], 'viewer.desktop', Name='Changed')
+        os.utime(self.dirs[2], ns=(st.st_atime_ns, st.st_mtime_ns))
+        _index.__init__()
+        eq_(self._get_names()['viewer.desktop'], 'Viewer')
+
+        # Replacing a file changes the directory's mtime.
+        os.unlink(path)
+        self._write(self.dirs[2], 'viewer.desktop', Name='Replaced')
+        os.utime(self.dirs[2], ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        _index.__init__()
+        eq_(self._get_names()['viewer.desktop'], 'Replaced')
+
+    def test_corrupt_index(self):
+        self._get_names()
+        directory = os.path.join(self.root, 'cache', 'standardpaths')
+        index_path = os.path.join(directory, os.listdir(directory)[0])
+        with open(index_path, 'w') as f:
+            json.dump({'version': 1, 'directories': {self.dirs[1]: 42}}, f)
+        _index.__init__()
+        eq_(self._get_names()['editor.desktop'], 'Editor A')
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_ensure_dirs
+----------------------------------
+
+Tests for creating directories of locations.
+"""
+
+import os
+import pathlib
+import platform
+import stat
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import (
+    Config, Location, LocationError, enable_stats, ensure_dirs, get_stats,
+)
+from standardpaths.filesystem import MemoryFileSystem, set_filesystem
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class EnsureDirsTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(EnsureDirsTests, self).setUp()
+        self.config = Config('Yksom', 'uranusjr')
+
+    def test_created(self):
+        locations = [
+            Location.log, Location.cache, Location.app_data, 'config',
+        ]
+        results = ensure_dirs(locations, self.config)
+        eq_(list(results), [
+            Location.log, Location.cache, Location.app_data, Location.config,
+        ])
+        eq_(results[Location.log],
+            pathlib.Path(self.home, '.cache', 'uranusjr', 'Yksom', 'log'))
+        for path in results.values():
+            self.assertTrue(path.is_dir())
+
+    def test_mode(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        results = ensure_dirs([Location.cache], self.config, mode=0o750)
+        eq_(results[Location.cache].stat().st_mode & 0o777, 0o750 & ~umask)
+
+    def test_memory_filesystem(self):
+        fs = MemoryFileSystem()
+        fs.add_dir(self.home)
+        set_filesystem(fs)
+        self.addCleanup(set_filesystem, None)
+        results = ensure_dirs([Location.log], self.config, mode=0o750)
+        path_str = str(results[Location.log])
+        eq_(fs.stat(path_str).st_mode & 0o777, 0o750)
+        self.assertFalse(os.path.exists(os.path.join(self.home, '.cache')))
+
+    def test_filesystem_switched(self):
+        path_str = str(ensure_dirs([Location.cache], self.config)[
+            Location.cache
+        ])
+        fs = MemoryFileSystem()
+        fs.add_dir(self.home)
+        set_filesystem(fs)
+        self.addCleanup(set_filesystem, None)
+        ensure_dirs([Location.cache], self.config)
+        self.assertTrue(stat.S_ISDIR(fs.stat(path_str).st_mode))
+
+    def test_remembered(self):
+        ensure_dirs([Location.cache, Location.log], self.config)
+        enable_stats()
+        ensure_dirs([Location.cache, Location.log], self.config)
+        eq_(get_stats().get('fs', {}), {})
+
+    def test_not_a_directory(self):
+        with open(os.path.join(self.home, '.cache'), 'w'):
+            pass
+        with self.assertRaises(LocationError):
+            ensure_dirs([Location.cache], self.config)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_filesystem
+----------------------------------
+
+Tests for resolution against in-memory and counting file systems.
+"""
+
+import os
+import pathlib
+import platform
+import stat
+import tempfile
+import unittest
+
+from nose.tools import eq_
+
+if platform.system() not in ('Darwin', 'Windows',):
+    from standardpaths.unix import Resolver
+
+from standardpaths import (
+    Location, clear_cache, disable_stats, enable_stats,
+    get_stats, get_writable_path,
+)
+from standardpaths.filesystem import (
+    CountingFileSystem, MemoryFileSystem, set_filesystem,
+)
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class MemoryFileSystemTests(unittest.TestCase):
+
+    def setUp(self):
+        self.fs = MemoryFileSystem(uid=1000)
+        self.fs.add_dir('/home/alice/.config')
+        self.resolver = Resolver(
+            {'XDG_RUNTIME_DIR': '/run/user/1000'}, '/home/alice', 1000,
+            filesystem=self.fs,
+        )
+
+    def test_user_dirs(self):
+        self.fs.add_file(
+            '/home/alice/.config/user-dirs.dirs',
+            'XDG_DESKTOP_DIR="$HOME/Bureau"\n',
+        )
+        eq_(self.resolver.writable_path(Location.desktop),
+            pathlib.Path('/home/alice/Bureau'))
+
+    def test_user_dirs_changed(self):
+        path = '/home/alice/.config/user-dirs.dirs'
+        self.fs.add_file(path, 'XDG_MUSIC_DIR="$HOME/A"\n')
+        eq_(self.resolver.writable_path(Location.music),
+            pathlib.Path('/home/alice/A'))
+        self.fs.add_file(path, 'XDG_MUSIC_DIR="$HOME/B"\n')
+        eq_(self.resolver.writable_path(Location.music),
+            pathlib.Path('/home/alice/B'))
+        self.fs.remove(path)
+        eq_(self.resolver.writable_path(Location.music),
+            pathlib.Path('/home/alice/Music'))
+
+    def test_runtime_permission_fixed(self):
+        from standardpaths.unix import _prepare_runtime_dir
+        self.fs.add_dir('/run/user/1000', mode=0o755)
+        _prepare_runtime_dir(pathlib.Path('/run/user/1000'), self.resolver)
+        eq_(stat.S_IMODE(self.fs.stat('/run/user/1000').st_mode), 0o700)
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class CountingFileSystemTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(CountingFileSystemTests, self).setUp()
+        os.mkdir(os.path.join(self.home, '.config'))
+        with open(os.path.join(self.home, '.config', 'user-dirs.dirs'),
+                  'w') as f:
+            f.write('XDG_DOCUMENTS_DIR="$HOME/Docs"\n')
+        self.fs = CountingFileSystem()
+        set_filesystem(self.fs)
+
+    def tearDown(self):
+        set_filesystem(None)
+
+    def test_cached_config_path_is_free(self):
+        get_writable_path(Location.config)
+        with self.fs.budget(0):
+            get_writable_path(Location.config)
+
+    def test_user_dir_costs_one_stat(self):
+        get_writable_path(Location.documents)
+        eq_(self.fs.counts['read_text'], 1)
+        with self.fs.budget(1):
+            eq_(get_writable_path(Location.documents),
+                pathlib.Path(self.home, 'Docs'))
+        eq_(self.fs.counts['read_text'], 1)
+
+    def test_budget_exceeded(self):
+        with self.assertRaises(AssertionError):
+            with self.fs.budget(0, 'stat'):
+                self.fs.stat(self.home)
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class TempDirTests(unittest.TestCase):
+
+    def setUp(self):
+        self.environ = os.environ.copy()
+        for name in ('TMPDIR', 'TEMP', 'TMP',):
+            os.environ.pop(name, None)
+        self.tempdir = tempfile.tempdir
+        tempfile.tempdir = None
+        self.memory_fs = MemoryFileSystem(uid=1000)
+        self.memory_fs.add_dir('/tmp', mode=0o1777, uid=0)
+        self.fs = CountingFileSystem(self.memory_fs)
+        set_filesystem(self.fs)
+
+    def tearDown(self):
+        from standardpaths.unix import set_strict_tempdir
+        set_strict_tempdir(False)
+        set_filesystem(None)
+        disable_stats()
+        os.environ.clear()
+        os.environ.update(self.environ)
+        tempfile.tempdir = self.tempdir
+        clear_cache()
+
+    def test_environ(self):
+        self.memory_fs.add_dir('/scratch')
+        os.environ['TMPDIR'] = '/scratch'
+        with self.fs.budget(1, 'access'):
+            eq_(get_writable_path(Location.temp), pathlib.Path('/scratch'))
+        with self.fs.budget(0):
+            eq_(get_writable_path(Location.temp), pathlib.Path('/scratch'))
+        os.environ['TMPDIR'] = '/tmp'
+        eq_(get_writable_path(Location.temp), pathlib.Path('/tmp'))
+
+    def test_not_writable_skipped(self):
+        self.memory_fs.add_dir('/scratch', mode=0o555)
+        os.environ['TMPDIR'] = '/scratch'
+        os.environ['TMP'] = '/missing'
+        eq_(get_writable_path(Location.temp), pathlib.Path('/tmp'))
+        eq_(self.fs.counts['access'], 3)
+
+    def test_none_usable(self):
+        self.memory_fs.remove('/tmp')
+        os.environ['TMPDIR'] = '/missing'
+        enable_stats()
+        eq_(get_writable_path(Location.temp), pathlib.Path('/missing'))
+        eq_(get_stats()['fallback'], {'temp': 1})
+
+    def test_strict(self):
+        from standardpaths.unix import set_strict_tempdir
+        self.memory_fs.remove('/tmp')
+        root = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, root)
+        tempfile.tempdir = None
+        os.environ['TMPDIR'] = root
+        set_strict_tempdir(True)
+        # Only the real file system has the directory, so it is found by
+        # probing with tempfile.
+        eq_(get_writable_path(Location.temp), pathlib.Path(root))
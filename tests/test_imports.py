@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_imports
+----------------------------------
+
+Tests that importing the package and resolving simple locations do not
+import modules they do not need, measured with `python -X importtime`.
+"""
+
+import os
+import platform
+import subprocess
+import sys
+import unittest
+
+# Modules that are slow to import, and should only be imported when needed.
+HEAVY_MODULES = frozenset([
+    'importlib.metadata', 'json', 'logging', 'pathlib', 'platform', 'pwd',
+    're', 'tempfile',
+])
+
+
+def _get_imported_modules(code):
+    """Run `code` in a new interpreter, and get the names of modules it
+    imports.
+    """
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__),
+    ))
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=env, stderr=subprocess.STDOUT, universal_newlines=True,
+    )
+    # Lines look like "import time:   123 |   456 |   package.module".
+    return {
+        line.rsplit('|', 1)[-1].strip() for line in output.splitlines()
+        if line.startswith('import time:')
+    }
+
+
+class ImportTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.baseline = _get_imported_modules('pass')
+
+    def _get_heavy_imports(self, code):
+        modules = _get_imported_modules(code) - self.baseline
+        return sorted(modules & HEAVY_MODULES)
+
+    def test_import(self):
+        self.assertEqual(self._get_heavy_imports('import standardpaths'), [])
+
+    @unittest.skipIf(
+        platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+    )
+    def test_resolve_as_str(self):
+        code = (
+            'import standardpaths\n'
+            'standardpaths.get_writable_path("home", as_str=True)\n'
+            'standardpaths.get_writable_path("cache", as_str=True)\n'
+            'standardpaths.get_writable_path("temp", as_str=True)\n'
+        )
+        self.assertEqual(self._get_heavy_imports(code), [])
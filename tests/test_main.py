@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_main
+----------------------------------
+
+Tests for the command line interface.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shlex
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import Config, get_standard_paths
+from standardpaths.__main__ import main
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class MainTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def _run(self, *args):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            eq_(main(list(args)), 0)
+        return stdout.getvalue()
+
+    def test_json(self):
+        output = self._run('--app', 'Yksom', '--org', 'uranusjr', 'cache')
+        eq_(json.loads(output), {
+            'cache': os.path.join(self.home, '.cache', 'uranusjr', 'Yksom'),
+        })
+
+    def test_json_standard_paths(self):
+        output = self._run('--standard-paths', 'app_data')
+        paths = get_standard_paths('app_data', Config(), as_str=True)
+        eq_(json.loads(output), {
+            'app_data': {
+                'writable_path': paths[0], 'standard_paths': paths,
+            },
+        })
+
+    def test_all(self):
+        os.environ['XDG_RUNTIME_DIR'] = os.path.join(self.home, 'run')
+        os.mkdir(os.environ['XDG_RUNTIME_DIR'], 0o700)
+        output = json.loads(self._run())
+        eq_(output['home'], self.home)
+        self.assertIn('log', output)
+
+    def test_shell(self):
+        output = self._run('--format', 'shell', 'home', 'app_local_data')
+        eq_(shlex.split(output), [
+            'STANDARDPATHS_HOME={}'.format(self.home),
+            'STANDARDPATHS_APP_LOCAL_DATA={}'.format(
+                os.path.join(self.home, '.local', 'share'),
+            ),
+        ])
+
+    def test_shell_prefix(self):
+        output = self._run('--format', 'shell', '--prefix', 'SP_', 'home')
+        eq_(shlex.split(output), ['SP_HOME={}'.format(self.home)])
+        output = self._run('--format', 'shell', '--prefix', '', 'home')
+        eq_(shlex.split(output), ['HOME={}'.format(self.home)])
+
+    def test_invalid_prefix(self):
+        for prefix in ('A B', '1_', 'X;rm'):
+            with contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    main(['--format', 'shell', '--prefix', prefix, 'home'])
+
+    def test_nul(self):
+        eq_(self._run('-0', 'home', 'cache'), '{0}\0{0}/.cache\0'.format(
+            self.home,
+        ))
+
+    def test_nul_standard_paths(self):
+        output = self._run('-0', '--standard-paths', 'home', 'app_data')
+        paths = get_standard_paths('app_data', Config(), as_str=True)
+        eq_(output, '\0'.join([self.home, ''] + paths + ['']) + '\0')
+
+    def test_unknown_location(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            with self.assertRaises(SystemExit):
+                main(['nowhere'])
+        self.assertIn('nowhere', stderr.getvalue())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_persistent
+----------------------------------
+
+Tests for the persistent resolution cache.
+"""
+
+import json
+import os
+import pathlib
+import platform
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import (
+    Config, Location, base, disable_persistent_cache, enable_persistent_cache,
+    enable_stats, get_standard_paths, get_stats, get_writable_path,
+)
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class PersistentCacheTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(PersistentCacheTests, self).setUp()
+        self.path = os.path.join(self.home, 'resolved.json')
+        self.config = Config('Yksom', 'uranusjr')
+        enable_persistent_cache(self.path)
+
+    def tearDown(self):
+        disable_persistent_cache()
+
+    def _restart(self):
+        """Simulate a new process reusing the same file.
+        """
+        enable_persistent_cache(self.path)
+        enable_stats()
+
+    def test_reused(self):
+        expected = get_writable_path(Location.app_data, self.config)
+        self.assertTrue(os.path.isfile(self.path))
+
+        self._restart()
+        eq_(get_writable_path(Location.app_data, self.config), expected)
+        eq_(get_writable_path('cache', self.config),
+            pathlib.Path(self.home, '.cache', 'uranusjr', 'Yksom'))
+        paths = get_standard_paths('generic_data', self.config, as_str=True)
+        eq_(paths[0], os.path.join(self.home, '.local', 'share'))
+        eq_(get_stats()['persistent'], {'hit': 1})
+
+    def test_environ_changed(self):
+        get_writable_path(Location.cache, self.config)
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.home, 'elsewhere')
+
+        self._restart()
+        eq_(get_writable_path(Location.cache, self.config),
+            pathlib.Path(self.home, 'elsewhere', 'uranusjr', 'Yksom'))
+        eq_(get_stats()['persistent'], {'miss': 1})
+
+    def test_user_dirs_not_stored(self):
+        from standardpaths.unix import start_watching, stop_watching
+        # While watching, user directories are cached in memory, but they
+        # must still be resolved (and watched) in each process.
+        start_watching()
+        self.addCleanup(stop_watching)
+        eq_(get_writable_path(Location.music, self.config),
+            pathlib.Path(self.home, 'Music'))
+        with open(self.path) as f:
+            stored = json.load(f)['configs']
+        for table in stored.values():
+            self.assertNotIn('music', table)
+            self.assertNotIn('runtime', table)
+
+        path = os.path.join(self.home, '.config', 'user-dirs.dirs')
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write('XDG_MUSIC_DIR="$HOME/Tunes"\n')
+        self._restart()
+        eq_(get_writable_path(Location.music, self.config),
+            pathlib.Path(self.home, 'Tunes'))
+        eq_(get_stats()['persistent'], {'hit': 1})
+
+    def test_configs_stored_separately(self):
+        get_writable_path(Location.cache, self.config)
+        get_writable_path(Location.cache, Config('Pepsi', ''))
+        with open(self.path) as f:
+            eq_(len(json.load(f)['configs']), 2)
+
+        self._restart()
+        eq_(get_writable_path(Location.cache, Config('Pepsi', '')),
+            pathlib.Path(self.home, '.cache', 'Pepsi'))
+        eq_(get_stats()['persistent'], {'hit': 1})
+
+    def test_corrupt_file(self):
+        with open(self.path, 'w') as f:
+            f.write('{')
+        eq_(get_writable_path(Location.cache, self.config),
+            pathlib.Path(self.home, '.cache', 'uranusjr', 'Yksom'))
+        with open(self.path) as f:
+            self.assertIn('configs', json.load(f))
+
+    def test_remove(self):
+        get_writable_path(Location.cache, self.config)
+        disable_persistent_cache(remove=True)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(base._persistent_cache)
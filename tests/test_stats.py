@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_stats
+----------------------------------
+
+Tests for resolution statistics.
+"""
+
+import platform
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import (
+    Location, enable_stats, get_stats, get_writable_path,
+)
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class StatsTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def test_disabled(self):
+        get_writable_path(Location.cache)
+        eq_(get_stats(), {})
+
+    def test_counts(self):
+        enable_stats()
+        get_writable_path(Location.cache)
+        get_writable_path(Location.cache)
+        get_writable_path(Location.documents)
+        stats = get_stats()
+        eq_(stats['calls'], {'cache': 2, 'documents': 1})
+        eq_(stats['cache'], {'hit': 1, 'miss': 1})
+        eq_(stats['fallback'], {'user-dirs': 1, 'documents': 1})
+        eq_(stats['fs'], {'stat': 1})
+        latency = stats['latency']['cache']
+        self.assertTrue(0 < latency['p50'] <= latency['p99'])
+        self.assertTrue(latency['p99'] <= latency['total'])
+
+    def test_hook(self):
+        events = []
+        enable_stats(hook=lambda *args: events.append(args))
+        get_writable_path(Location.generic_cache)
+        eq_([event[:2] for event in events],
+            [('cache', 'miss'), ('call', 'generic_cache')])
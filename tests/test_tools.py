@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_tools
+----------------------------------
+
+Tests for `standardpaths.tools`.
+"""
+
+import os
+import pathlib
+import platform
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import eq_
+
+from standardpaths import Location, clear_cache
+from standardpaths.tools import (
+    LocateOption, find_executable, find_executables, get_existing_paths,
+    locate, locate_all, _executable_index, _locate_index, _stat_index,
+)
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class LocateTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.environ = os.environ.copy()
+        self.data_dirs = [
+            os.path.join(self.root, name) for name in ('home', 'a', 'b',)
+        ]
+        os.environ['XDG_DATA_HOME'] = self.data_dirs[0]
+        os.environ['XDG_DATA_DIRS'] = ':'.join(self.data_dirs[1:])
+        for path in self.data_dirs:
+            os.makedirs(os.path.join(path, 'themes'))
+        self._touch(self.data_dirs[1], 'themes', 'default.css')
+        self._touch(self.data_dirs[2], 'themes', 'default.css')
+        self._touch(self.data_dirs[2], 'themes', 'dark.css')
+        clear_cache()
+        _locate_index.clear()
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.root)
+        clear_cache()
+        _locate_index.clear()
+
+    def _touch(self, *parts):
+        with open(os.path.join(*parts), 'w'):
+            pass
+
+    def test_locate(self):
+        eq_(locate(Location.generic_data, 'themes/default.css'),
+            pathlib.Path(self.data_dirs[1], 'themes', 'default.css'))
+        eq_(locate(Location.generic_data, 'themes/missing.css'), None)
+
+    def test_locate_all(self):
+        eq_(locate_all(Location.generic_data, 'themes/default.css'), [
+            pathlib.Path(self.data_dirs[1], 'themes', 'default.css'),
+            pathlib.Path(self.data_dirs[2], 'themes', 'default.css'),
+        ])
+
+    def test_options(self):
+        eq_(locate(Location.generic_data, 'themes'), None)
+        eq_(locate_all(Location.generic_data, 'themes',
+                       LocateOption.directory),
+            [pathlib.Path(path, 'themes') for path in self.data_dirs])
+
+    def test_outside_location(self):
+        for filename in ('/etc/passwd', '../../../etc/passwd', 'themes/../..'):
+            with self.assertRaises(ValueError):
+                locate(Location.generic_data, filename)
+            with self.assertRaises(ValueError):
+                locate_all(Location.generic_data, filename)
+        eq_(locate(Location.generic_data, 'themes/../themes/dark.css'),
+            pathlib.Path(self.data_dirs[2], 'themes', 'dark.css'))
+
+    def test_workers(self):
+        eq_(locate(Location.generic_data, 'themes/dark.css', workers=4),
+            pathlib.Path(self.data_dirs[2], 'themes', 'dark.css'))
+
+    def test_index_invalidated(self):
+        eq_(locate(Location.generic_data, 'themes/light.css'), None)
+        self._touch(self.data_dirs[0], 'themes', 'light.css')
+        eq_(locate(Location.generic_data, 'themes/light.css'),
+            pathlib.Path(self.data_dirs[0], 'themes', 'light.css'))
+        os.remove(os.path.join(self.data_dirs[0], 'themes', 'light.css'))
+        eq_(locate(Location.generic_data, 'themes/light.css'), None)
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class ExistingPathsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.environ = os.environ.copy()
+        self.paths = {
+            name: os.path.join(self.root, name)
+            for name in ('home', 'a', 'link', 'missing', 'file', 'b',)
+        }
+        for name in ('a', 'b',):
+            os.mkdir(self.paths[name])
+        os.symlink(self.paths['a'], self.paths['link'])
+        with open(self.paths['file'], 'w'):
+            pass
+        os.environ['XDG_DATA_HOME'] = self.paths['home']
+        os.environ['XDG_DATA_DIRS'] = ':'.join(
+            self.paths[name]
+            for name in ('a', 'link', 'missing', 'file', 'a', 'b',)
+        )
+        clear_cache()
+        _stat_index.clear()
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.root)
+        clear_cache()
+        _stat_index.clear()
+
+    def test_existing_deduplicated(self):
+        eq_(get_existing_paths(Location.generic_data),
+            [pathlib.Path(self.paths['a']), pathlib.Path(self.paths['b'])])
+
+    def test_workers(self):
+        eq_(get_existing_paths(Location.generic_data, as_str=True, workers=4),
+            [self.paths['a'], self.paths['b']])
+
+    def test_cached(self):
+        get_existing_paths(Location.generic_data)
+        os.mkdir(self.paths['home'])
+        eq_(get_existing_paths(Location.generic_data, as_str=True),
+            [self.paths['a'], self.paths['b']])
+        _stat_index.interval = 0
+        try:
+            eq_(get_existing_paths(Location.generic_data, as_str=True),
+                [self.paths['home'], self.paths['a'], self.paths['b']])
+        finally:
+            _stat_index.interval = 1.0
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'POSIX only')
+class FindExecutableTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.bins = [os.path.join(self.root, name) for name in ('a', 'b',)]
+        for path in self.bins:
+            os.mkdir(path)
+        self._touch(self.bins[0], 'tool', 0o644)
+        self._touch(self.bins[1], 'tool', 0o755)
+        self._touch(self.bins[1], 'helper', 0o755)
+        _executable_index.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        _executable_index.clear()
+
+    def _touch(self, directory, name, mode):
+        path = os.path.join(directory, name)
+        with open(path, 'w'):
+            pass
+        os.chmod(path, mode)
+
+    def test_find_executable(self):
+        eq_(find_executable('tool', self.bins),
+            pathlib.Path(self.bins[1], 'tool'))
+        eq_(find_executable('missing', self.bins), None)
+
+    def test_permission_changed(self):
+        self._touch(self.bins[0], 'helper', 0o644)
+        eq_(find_executable('helper', self.bins),
+            pathlib.Path(self.bins[1], 'helper'))
+        os.chmod(os.path.join(self.bins[0], 'helper'), 0o755)
+        eq_(find_executable('helper', self.bins),
+            pathlib.Path(self.bins[0], 'helper'))
+        os.chmod(os.path.join(self.bins[0], 'helper'), 0o644)
+        os.chmod(os.path.join(self.bins[1], 'helper'), 0o644)
+        eq_(find_executable('helper', self.bins), None)
+
+    def test_created(self):
+        eq_(find_executable('fresh', self.bins), None)
+        self._touch(self.bins[0], 'fresh', 0o755)
+        eq_(find_executable('fresh', self.bins),
+            pathlib.Path(self.bins[0], 'fresh'))
+
+    def test_absolute(self):
+        eq_(find_executable(os.path.join(self.bins[1], 'helper')),
+            pathlib.Path(self.bins[1], 'helper'))
+        eq_(find_executable(os.path.join(self.bins[0], 'tool')), None)
+
+    def test_path_environment(self):
+        environ = os.environ.copy()
+        os.environ['PATH'] = os.pathsep.join(self.bins)
+        try:
+            eq_(find_executable('helper'),
+                pathlib.Path(self.bins[1], 'helper'))
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+
+    def test_find_executables(self):
+        eq_(find_executables(['tool', 'helper', 'missing'], self.bins), {
+            'tool': pathlib.Path(self.bins[1], 'tool'),
+            'helper': pathlib.Path(self.bins[1], 'helper'),
+            'missing': None,
+        })
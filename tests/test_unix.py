@@ -0,0 +1,427 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_unix
+----------------------------------
+
+Tests for the Free Desktop implementation, run against a fake home.
+"""
+
+import os
+import pickle
+import pathlib
+import platform
+import tempfile
+import time
+import unittest
+
+from nose.tools import eq_
+
+if platform.system() not in ('Darwin', 'Windows',):
+    import pwd
+    from standardpaths.unix import (
+        Resolver, for_users, start_watching, stop_watching,
+    )
+
+from standardpaths.filesystem import (
+    MemoryFileSystem, RealFileSystem, set_filesystem,
+)
+from standardpaths import (
+    Config, Location, LocationError, enable_stats, get_standard_paths,
+    get_stats, get_writable_path, resolve_all, resolve_many,
+)
+
+from . import TemporaryHomeMixin
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class UserDirsTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(UserDirsTests, self).setUp()
+        os.mkdir(os.path.join(self.home, '.config'))
+        self.user_dirs = os.path.join(self.home, '.config', 'user-dirs.dirs')
+
+    def _write_user_dirs(self, *lines):
+        with open(self.user_dirs, 'w') as f:
+            f.write('# Written by xdg-user-dirs-update\n')
+            for line in lines:
+                f.write(line + '\n')
+
+    def test_missing_file(self):
+        eq_(get_writable_path(Location.desktop),
+            pathlib.Path(self.home, 'Desktop'))
+        eq_(get_writable_path(Location.download),
+            pathlib.Path(self.home, 'Downloads'))
+
+    def test_read(self):
+        self._write_user_dirs(
+            'XDG_DESKTOP_DIR="$HOME/Schreibtisch"',
+            'XDG_MUSIC_DIR=""',
+        )
+        eq_(get_writable_path(Location.desktop),
+            pathlib.Path(self.home, 'Schreibtisch'))
+        eq_(get_writable_path(Location.music),
+            pathlib.Path(self.home, 'Music'))
+
+    def test_reread_on_change(self):
+        self._write_user_dirs('XDG_DESKTOP_DIR="$HOME/Bureau"')
+        eq_(get_writable_path(Location.desktop),
+            pathlib.Path(self.home, 'Bureau'))
+        self._write_user_dirs('XDG_DESKTOP_DIR="$HOME/Escritorio/"')
+        eq_(get_writable_path(Location.desktop),
+            pathlib.Path(self.home, 'Escritorio'))
+        os.remove(self.user_dirs)
+        eq_(get_writable_path(Location.desktop),
+            pathlib.Path(self.home, 'Desktop'))
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class ResolveManyTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(ResolveManyTests, self).setUp()
+        os.environ['XDG_RUNTIME_DIR'] = self.home
+        os.environ['XDG_DATA_DIRS'] = '/usr/local/share:/usr/share'
+
+    def test_same_as_individual_calls(self):
+        config = Config('Yksom', 'uranusjr')
+        results = resolve_all(config)
+        eq_(list(results), list(Location))
+        for location, resolved in results.items():
+            eq_(resolved.writable_path, get_writable_path(location, config))
+            eq_(list(resolved.standard_paths),
+                get_standard_paths(location, config))
+
+    def test_strings_and_order(self):
+        results = resolve_many(['log', Location.cache, 'log'])
+        eq_(list(results), [Location.log, Location.cache])
+        eq_(results[Location.log].writable_path,
+            results[Location.cache].writable_path / 'log')
+
+    def test_immutable(self):
+        results = resolve_many([Location.home])
+        with self.assertRaises(TypeError):
+            results[Location.home] = None
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class ResolverTests(unittest.TestCase):
+
+    def setUp(self):
+        self.resolver = Resolver(
+            {'XDG_CACHE_HOME': '/var/cache/u', 'XDG_DATA_DIRS': '/a:/b:/a'},
+            home='/nonexistent/u', uid=4242,
+        )
+
+    def test_explicit_inputs(self):
+        eq_(self.resolver.writable_path(Location.home),
+            pathlib.Path('/nonexistent/u'))
+        eq_(self.resolver.writable_path(Location.config),
+            pathlib.Path('/nonexistent/u/.config'))
+        eq_(self.resolver.writable_path(Location.cache, Config('Y', 'u')),
+            pathlib.Path('/var/cache/u/u/Y'))
+        eq_(self.resolver.writable_path(Location.documents),
+            pathlib.Path('/nonexistent/u/Documents'))
+        eq_(self.resolver.standard_paths(Location.generic_data), [
+            pathlib.Path('/nonexistent/u/.local/share'),
+            pathlib.Path('/a'), pathlib.Path('/b'),
+        ])
+
+    def test_root_home(self):
+        resolver = Resolver({'XDG_CONFIG_HOME': '~'}, home='/', uid=4242)
+        eq_(resolver.writable_path(Location.generic_cache, as_str=True),
+            '/.cache')
+        eq_(resolver.writable_path(Location.config, as_str=True), '/')
+        eq_(resolver.writable_path(Location.generic_cache),
+            pathlib.Path('/.cache'))
+
+    def test_default_dirs(self):
+        resolver = Resolver(
+            {'XDG_DATA_DIRS': '', 'XDG_CONFIG_DIRS': ':relative'},
+            home='/nonexistent/u', uid=4242,
+        )
+        eq_(resolver.standard_paths(Location.generic_data, as_str=True), [
+            '/nonexistent/u/.local/share', '/usr/local/share', '/usr/share',
+        ])
+        eq_(resolver.standard_paths(Location.generic_config, as_str=True), [
+            '/nonexistent/u/.config', '/etc/xdg',
+        ])
+
+    def test_config_dirs_normalized(self):
+        resolver = Resolver(
+            {'XDG_CONFIG_DIRS': '/etc/xdg/::/opt//xdg:relative:/etc/xdg'},
+            home='/nonexistent/u', uid=4242,
+        )
+        eq_(resolver.standard_paths(Location.config, as_str=True), [
+            '/nonexistent/u/.config', '/etc/xdg', '/opt/xdg',
+        ])
+
+    def test_derived_dirs(self):
+        resolver = Resolver(
+            {'XDG_DATA_DIRS': '/a:/'}, home='/nonexistent/u', uid=4242,
+        )
+        eq_(resolver.standard_paths(Location.applications, as_str=True), [
+            '/nonexistent/u/.local/share/applications',
+            '/a/applications', '/applications',
+        ])
+        for config, expected in [
+                (Config('Y', 'u'), ['/a/u/Y', '/u/Y']),
+                (Config('Y', ''), ['/a/Y', '/Y']),
+                (Config('a/b', 'c'), ['/a/c/a/b', '/c/a/b'])]:
+            paths = resolver.standard_paths(
+                Location.app_data, config, as_str=True,
+            )
+            eq_(paths[1:], expected)
+
+    def test_runtime_is_not_created(self):
+        resolver = Resolver(
+            {'XDG_RUNTIME_DIR': '/nonexistent/run/4242'},
+            home='/nonexistent/u', uid=4242,
+        )
+        eq_(resolver.writable_path(Location.runtime),
+            pathlib.Path('/nonexistent/run/4242'))
+
+    def test_username_memoized(self):
+        resolver = Resolver({}, home='/nonexistent/u', uid=os.geteuid())
+        name = resolver.username
+        eq_(resolver._username, name)
+        eq_(resolver.username, name)
+
+    def test_pickle(self):
+        self.resolver.standard_paths(Location.generic_data)
+        resolver = pickle.loads(pickle.dumps(self.resolver))
+        eq_(resolver.environ, self.resolver.environ)
+        eq_(resolver.resolve_many(Location).keys(),
+            self.resolver.resolve_many(Location).keys())
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class RuntimeTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(RuntimeTests, self).setUp()
+        os.environ['TMPDIR'] = self.home
+        os.environ.pop('XDG_RUNTIME_DIR', None)
+        tempfile.tempdir = None     # Make tempfile re-read TMPDIR.
+
+    def tearDown(self):
+        tempfile.tempdir = None
+
+    def test_fallback_created(self):
+        with self.assertLogs('standardpaths', 'WARNING'):
+            path = get_writable_path(Location.runtime)
+        eq_(path.parent, pathlib.Path(self.home))
+        eq_(path.stat().st_mode & 0o777, 0o700)
+        eq_(path.stat().st_uid, os.geteuid())
+
+    def test_permission_fixed(self):
+        path = os.path.join(self.home, 'run')
+        os.mkdir(path, 0o755)
+        os.environ['XDG_RUNTIME_DIR'] = path
+        eq_(get_writable_path(Location.runtime), pathlib.Path(path))
+        eq_(os.stat(path).st_mode & 0o777, 0o700)
+        os.chmod(path, 0o755)
+        get_writable_path(Location.runtime)
+        eq_(os.stat(path).st_mode & 0o777, 0o700)
+
+    def test_symlink_rejected(self):
+        target = os.path.join(self.home, 'mine')
+        os.mkdir(target, 0o755)
+        path = os.path.join(
+            self.home, 'runtime-' + pwd.getpwuid(os.geteuid()).pw_name,
+        )
+        os.symlink(target, path)
+        with self.assertRaises(LocationError):
+            get_writable_path(Location.runtime)
+        eq_(os.stat(target).st_mode & 0o777, 0o755)
+        # The open used after checks does not follow it either.
+        with self.assertRaises(OSError):
+            RealFileSystem().open_dir(path)
+
+    def test_missing(self):
+        os.environ['XDG_RUNTIME_DIR'] = os.path.join(self.home, 'missing')
+        with self.assertRaises(LocationError):
+            get_writable_path(Location.runtime)
+        eq_(get_standard_paths(Location.runtime), [])
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class ForUsersTests(unittest.TestCase):
+
+    def setUp(self):
+        self.entry = pwd.getpwuid(os.geteuid())
+        fs = MemoryFileSystem()
+        fs.add_file(
+            os.path.join(self.entry.pw_dir, '.config', 'user-dirs.dirs'),
+            'XDG_DOCUMENTS_DIR="$HOME/Docs"\n',
+        )
+        set_filesystem(fs)
+
+    def tearDown(self):
+        set_filesystem(None)
+
+    def test_for_user(self):
+        for user in (self.entry.pw_uid, self.entry.pw_name):
+            resolver = Resolver.for_user(user)
+            eq_(resolver.writable_path(Location.home),
+                pathlib.Path(self.entry.pw_dir))
+            eq_(resolver.writable_path(Location.documents),
+                pathlib.Path(self.entry.pw_dir, 'Docs'))
+            eq_(resolver.username, self.entry.pw_name)
+
+    def test_for_user_unknown(self):
+        with self.assertRaises(KeyError):
+            Resolver.for_user('standardpaths-no-such-user')
+
+    def test_for_users(self):
+        users = [
+            self.entry.pw_uid, 'standardpaths-no-such-user',
+            self.entry.pw_name,
+        ]
+        for workers in (None, 4):
+            results = for_users(
+                users, ['documents', Location.cache], Config('Yksom'),
+                workers=workers,
+            )
+            eq_(list(results), [self.entry.pw_name])
+            paths = results[self.entry.pw_name]
+            eq_(list(paths), [Location.documents, Location.cache])
+            eq_(paths[Location.documents].writable_path,
+                pathlib.Path(self.entry.pw_dir, 'Docs'))
+            eq_(paths[Location.cache].writable_path,
+                pathlib.Path(self.entry.pw_dir, '.cache', 'Yksom'))
+
+    def test_all_users(self):
+        results = for_users(locations=[Location.home], as_str=True)
+        eq_(results[self.entry.pw_name][Location.home].writable_path,
+            self.entry.pw_dir)
+
+
+@unittest.skipIf(
+    platform.system() in ('Darwin', 'Windows',), 'Free Desktop only',
+)
+class StringPathsTests(unittest.TestCase):
+
+    ENVIRONS = [
+        {},
+        {'XDG_CACHE_HOME': '/var/cache/u/', 'XDG_DATA_HOME': '//data//u'},
+        {'XDG_CONFIG_HOME': '~/./conf/.', 'XDG_DATA_DIRS': '/a/:/b/../c:/'},
+        {'XDG_CACHE_HOME': '/', 'XDG_CONFIG_DIRS': '/etc/xdg/::/opt//xdg'},
+        {'XDG_RUNTIME_DIR': '/run/user/4242/', 'TMPDIR': '/tmp//x/'},
+        {'XDG_DATA_HOME': 'relative/./data', 'XDG_CACHE_HOME': '.cache'},
+    ]
+
+    CONFIGS = [
+        None, Config('Yksom', 'uranusjr'), Config('a/b', 'c'),
+        Config('..', '.'), Config('/abs', ''), Config('', 'org/'),
+    ]
+
+    def test_same_as_paths(self):
+        for environ in self.ENVIRONS:
+            for home in ('/home/u', '/home/u/', '/'):
+                resolver = Resolver(environ, home=home, uid=4242)
+                for config in self.CONFIGS:
+                    for location in Location:
+                        self._check(resolver, location, config)
+
+    def test_public_functions(self):
+        config = Config('Yksom', 'uranusjr')
+        for location in (Location.cache, Location.documents, Location.temp):
+            eq_(get_writable_path(location, config, as_str=True),
+                str(get_writable_path(location, config)))
+            eq_(get_standard_paths(location, config, as_str=True),
+                [str(p) for p in get_standard_paths(location, config)])
+        results = resolve_all(config, as_str=True)
+        eq_(results[Location.log].writable_path,
+            str(get_writable_path(Location.log, config)))
+
+    def _check(self, resolver, location, config):
+        try:
+            path = resolver.writable_path(location, config)
+        except LocationError:
+            path = None
+        else:
+            eq_(resolver.writable_path(location, config, as_str=True),
+                str(path))
+        eq_(resolver.standard_paths(location, config, as_str=True),
+            [str(p) for p in resolver.standard_paths(location, config)])
+        results = resolver.resolve_many([location], config, as_str=True)
+        eq_(results[location].writable_path,
+            None if path is None else str(path))
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(0.01)
+
+
+@unittest.skipIf(platform.system() != 'Linux', 'Linux only')
+class WatchTests(TemporaryHomeMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(WatchTests, self).setUp()
+        os.environ['XDG_RUNTIME_DIR'] = os.path.join(self.home, 'run')
+        os.mkdir(os.environ['XDG_RUNTIME_DIR'], 0o700)
+        self.user_dirs = os.path.join(self.home, '.config', 'user-dirs.dirs')
+        if not start_watching():
+            self.skipTest('inotify not available')
+
+    def tearDown(self):
+        stop_watching()
+
+    def _write_user_dirs(self, line):
+        # Replace the file like xdg-user-dirs-update does.
+        with open(self.user_dirs + '.new', 'w') as f:
+            f.write(line + '\n')
+        os.rename(self.user_dirs + '.new', self.user_dirs)
+
+    def test_cached_without_file_system_access(self):
+        os.mkdir(os.path.join(self.home, '.config'))
+        self._write_user_dirs('XDG_MUSIC_DIR="$HOME/Tunes"')
+        get_writable_path(Location.music)
+        get_writable_path(Location.runtime)
+        enable_stats()
+        eq_(get_writable_path(Location.music),
+            pathlib.Path(self.home, 'Tunes'))
+        get_writable_path(Location.runtime)
+        eq_(get_stats().get('fs', {}), {})
+
+    def test_user_dirs_changed(self):
+        # The config directory does not exist yet.
+        eq_(get_writable_path(Location.music),
+            pathlib.Path(self.home, 'Music'))
+        os.mkdir(os.path.join(self.home, '.config'))
+        self._write_user_dirs('XDG_MUSIC_DIR="$HOME/A"')
+        _wait_for(lambda: get_writable_path(Location.music) == pathlib.Path(
+            self.home, 'A',
+        ))
+        self._write_user_dirs('XDG_MUSIC_DIR="$HOME/B"')
+        _wait_for(lambda: get_writable_path(Location.music) == pathlib.Path(
+            self.home, 'B',
+        ))
+
+    def test_runtime_permission_fixed(self):
+        path = os.environ['XDG_RUNTIME_DIR']
+        get_writable_path(Location.runtime)
+        os.chmod(path, 0o755)
+
+        def fixed():
+            get_writable_path(Location.runtime)
+            return os.stat(path).st_mode & 0o777 == 0o700
+
+        _wait_for(fixed)